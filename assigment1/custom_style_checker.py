@@ -1,40 +1,127 @@
 import ast
+import importlib
+import json
 import re
 import os
 import shutil
-from typing import List
+import time
+from importlib.util import decode_source
+from typing import Callable, Dict, List, Optional, TextIO, Union
 
 class PythonStyleChecker:
-    def __init__(self, file_path: str):
+    # Check name -> method name, "module:function" string imported on first use,
+    # or a function taking (checker, tree).
+    CHECKS: Dict[str, Union[str, Callable]] = {
+        "structure": "check_file_structure",
+        "docstrings": "check_docstrings",
+        "annotations": "check_type_annotations",
+        "naming": "check_naming_conventions",
+    }
+
+    def __init__(self, file_path: str, source: Optional[Union[str, bytes, bytearray, memoryview]] = None,
+                 findings_stream: Optional[TextIO] = None, profile: bool = False,
+                 select: Optional[List[str]] = None):
+        """
+        file_path names the checked module and decides where the report is written.
+        When source is given (a string, a bytes buffer or a memory-mapped file) it is
+        checked directly and file_path is never read.
+        When findings_stream is given, every finding is also written to it as a
+        JSON Lines record the moment it is found.
+        With profile=True the time and node count of every phase is kept in
+        self.profile and added to the report.
+        select names the checks to run, in order; by default all of CHECKS run.
+        """
         self.file_path = file_path
-        self.file_name = os.path.basename(file_path).replace(".txt", "")
+        self.file_name = os.path.basename(file_path).replace(".txt", "").replace(".py", "")
+        self.source = source
+        self.findings_stream = findings_stream
+        self.file_content = ""
         self.report = []
+        self.profile: Optional[Dict[str, List[float]]] = {} if profile else None
+        self.node_count = 0
+        self.select = list(self.CHECKS) if select is None else select
+
+    @classmethod
+    def register_check(cls, name: str, check: Union[str, Callable]) -> None:
+        cls.CHECKS[name] = check
+
+    def resolve_check(self, name: str) -> Callable:
+        if name not in self.CHECKS:
+            raise ValueError(f"Unknown check {name!r}; available checks: {', '.join(self.CHECKS)}")
+        check = self.CHECKS[name]
+        if isinstance(check, str):
+            if ":" not in check:
+                return getattr(self, check)
+            module_name, _, attribute = check.partition(":")
+            check = getattr(importlib.import_module(module_name), attribute)
+            self.CHECKS[name] = check
+        return lambda tree: check(self, tree)
+
+    def read_source(self) -> str:
+        if self.source is None:
+            with open(self.file_path, 'r') as file:
+                return file.read()
+        if isinstance(self.source, str):
+            return self.source
+        return decode_source(bytes(self.source))
+
+    def timed(self, phase: str, action, *args, nodes: int = 0):
+        if self.profile is None:
+            return action(*args)
+        start = time.perf_counter()
+        result = action(*args)
+        self.profile[phase] = [time.perf_counter() - start, nodes]
+        return result
 
     def generate_report(self) -> None:
-        with open(self.file_path, 'r') as file:
-            file_content = file.read()
+        self.file_content = self.timed("read", self.read_source)
 
-        tree = ast.parse(file_content)
+        tree = self.timed("parse", ast.parse, self.file_content)
         
-        self.set_parents(tree)
+        self.timed("set_parents", self.set_parents, tree)
+        if self.profile is not None:
+            self.profile["set_parents"][1] = self.node_count
         
-        self.check_file_structure(tree)
-        self.check_docstrings(tree)
-        self.check_type_annotations(tree)
-        self.check_naming_conventions(tree)
+        for name in self.select:
+            self.timed(name, self.resolve_check(name), tree, nodes=self.node_count)
+
+        if self.profile is not None:
+            self.report.append("Profile:")
+            for phase, (seconds, nodes) in self.profile.items():
+                self.report.append(f"{phase}: {seconds * 1000:.3f} ms, {nodes} nodes")
         
         self.write_report()
 
+    def emit_finding(self, node: ast.AST, rule: str, message: str) -> None:
+        if self.findings_stream is None:
+            return
+        record = {"file_path": self.file_path, "line": node.lineno, "column": node.col_offset,
+                  "rule": rule, "message": message}
+        self.findings_stream.write(json.dumps(record) + "\n")
+
     def set_parents(self, node, parent=None):
-        for child in ast.iter_child_nodes(node):
-            child.parent = parent
-            self.set_parents(child, node)
+        """
+        Link every node to its parent and to its enclosing class or function (scope)
+        using an explicit stack, so deeply nested sources cannot exhaust the recursion limit.
+        """
+        node.parent = parent
+        node.scope = None
+        self.node_count = 0
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self.node_count += 1
+            child_scope = current if isinstance(current, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) else current.scope
+            for child in ast.iter_child_nodes(current):
+                child.parent = current
+                child.scope = child_scope
+                stack.append(child)
 
     def check_file_structure(self, tree: ast.Module) -> None:
-        num_lines = sum(1 for _ in open(self.file_path))
-        imports = [node.names[0].name for node in ast.walk(tree) if isinstance(node, ast.Import)]
+        num_lines = self.file_content.count('\n') + (1 if self.file_content and not self.file_content.endswith('\n') else 0)
+        imports = [alias.name for node in ast.walk(tree) if isinstance(node, ast.Import) for alias in node.names]
         classes = [node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
-        functions = [node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef) and not isinstance(getattr(node, 'parent', None), ast.ClassDef)]
+        functions = [node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef) and not isinstance(getattr(node, 'scope', None), ast.ClassDef)]
         
         self.report.append(f"File structure:\nTotal lines of code: {num_lines}")
         self.report.append(f"Imports: {', '.join(imports) if imports else 'None'}")
@@ -50,13 +137,15 @@ class PythonStyleChecker:
                     self.report.append(f"{node.name}: {docstring}")
                 else:
                     self.report.append(f"{node.name}: DocString not found.")
+                    self.emit_finding(node, "docstrings", f"{node.name} has no docstring")
         self.report.append("\n")
 
     def check_type_annotations(self, tree: ast.Module) -> None:
-        functions_without_annotations = [
-            node.name for node in ast.walk(tree)
-            if isinstance(node, ast.FunctionDef) and not node.returns and not any(arg.annotation for arg in node.args.args)
-        ]
+        functions_without_annotations = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.FunctionDef) and not node.returns and not any(arg.annotation for arg in node.args.args):
+                functions_without_annotations.append(node.name)
+                self.emit_finding(node, "annotations", f"{node.name} has no type annotations")
         
         if functions_without_annotations:
             self.report.append("Type Annotation Check:\nFunctions without type annotations:")
@@ -69,15 +158,15 @@ class PythonStyleChecker:
         camel_case_pattern = re.compile(r'^[A-Z][a-zA-Z0-9]*$')
         snake_case_pattern = re.compile(r'^[a-z_][a-z0-9_]*$')
 
-        classes_with_wrong_naming = [
-            node.name for node in ast.walk(tree)
-            if isinstance(node, ast.ClassDef) and not camel_case_pattern.match(node.name)
-        ]
-
-        functions_with_wrong_naming = [
-            node.name for node in ast.walk(tree)
-            if isinstance(node, ast.FunctionDef) and not snake_case_pattern.match(node.name)
-        ]
+        classes_with_wrong_naming = []
+        functions_with_wrong_naming = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef) and not camel_case_pattern.match(node.name):
+                classes_with_wrong_naming.append(node.name)
+                self.emit_finding(node, "naming", f"class {node.name} is not CamelCase")
+            elif isinstance(node, ast.FunctionDef) and not snake_case_pattern.match(node.name):
+                functions_with_wrong_naming.append(node.name)
+                self.emit_finding(node, "naming", f"function {node.name} is not snake_case")
 
         if classes_with_wrong_naming:
             self.report.append("Classes with incorrect naming conventions:")
@@ -101,11 +190,16 @@ class PythonStyleChecker:
 
 
 class PythonFileConverter:
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, keep_copies: bool = False):
+        """
+        By default the module is checked in place and no intermediate files are written.
+        Pass keep_copies=True for the original .py -> .txt -> _restored.py round-trip.
+        """
         self.file_path = file_path
         self.file_name = os.path.basename(file_path).replace(".py", "")
         self.txt_file_path = os.path.join(os.path.dirname(file_path), f"{self.file_name}.txt")
-        self.style_checker = PythonStyleChecker(self.txt_file_path)
+        self.keep_copies = keep_copies
+        self.style_checker = PythonStyleChecker(self.txt_file_path if keep_copies else file_path)
 
     def convert_to_txt(self) -> None:
         with open(self.file_path, "r") as py_file:
@@ -123,10 +217,88 @@ class PythonFileConverter:
         print(f"Converted {self.txt_file_path} back to {restored_file_path}")
 
     def execute(self) -> None:
+        if not self.keep_copies:
+            self.run_style_checker()
+            return
         self.convert_to_txt()
         self.run_style_checker()
         self.convert_back_to_py()
 
+class StyleWatcher:
+    def __init__(self, directory: str, interval: float = 1.0, debounce: float = 0.5):
+        """
+        Polls directory for .py files and re-runs PythonStyleChecker on the ones
+        whose modification time changed, once no further saves happened for
+        debounce seconds. The latest report of every file is kept in self.results.
+        """
+        self.directory = directory
+        self.interval = interval
+        self.debounce = debounce
+        self.mtimes: Dict[str, int] = {}
+        self.results: Dict[str, List[str]] = {}
+        self.errors: Dict[str, str] = {}
+        self.pending = set()
+        self.last_change = 0.0
+
+    def scan(self) -> Dict[str, int]:
+        mtimes = {}
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".py"):
+                    path = os.path.join(root, name)
+                    try:
+                        mtimes[path] = os.stat(path).st_mtime_ns
+                    except OSError:
+                        pass
+        return mtimes
+
+    def check(self, path: str) -> None:
+        checker = PythonStyleChecker(path)
+        try:
+            checker.generate_report()
+        except (OSError, SyntaxError, UnicodeDecodeError, ValueError, RecursionError, MemoryError) as error:
+            self.results.pop(path, None)
+            self.errors[path] = f"{type(error).__name__}: {error}"
+            print(f"Skipped {path}: {self.errors[path]}")
+            return
+        self.errors.pop(path, None)
+        self.results[path] = checker.report
+
+    def poll(self) -> bool:
+        current = self.scan()
+        changed = {path for path, mtime in current.items() if self.mtimes.get(path) != mtime}
+        for path in self.mtimes.keys() - current.keys():
+            self.results.pop(path, None)
+            self.errors.pop(path, None)
+            self.pending.discard(path)
+        self.mtimes = current
+        if changed:
+            self.pending |= changed
+            self.last_change = time.monotonic()
+            return False
+        if self.pending and time.monotonic() - self.last_change >= self.debounce:
+            for path in sorted(self.pending):
+                self.check(path)
+            self.pending.clear()
+            return True
+        return False
+
+    def summary(self) -> str:
+        return f"Files indexed: {len(self.results)}\nFiles with errors: {len(self.errors)}"
+
+    def run(self) -> None:
+        self.mtimes = self.scan()
+        for path in sorted(self.mtimes):
+            self.check(path)
+        print(self.summary())
+        try:
+            while True:
+                time.sleep(self.interval)
+                if self.poll():
+                    print(self.summary())
+        except KeyboardInterrupt:
+            pass
+
 # Sample usage
 if __name__ == "__main__":
     '''This is my sample file I used, replace with wanted file for checker and use double backlashes'''
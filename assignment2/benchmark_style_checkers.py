@@ -0,0 +1,202 @@
+import argparse
+import ast
+import contextlib
+import gc
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import functional_style_checker as functional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assigment1"))
+from custom_style_checker import PythonStyleChecker
+
+class CorpusSpec(NamedTuple):
+    name: str
+    classes: int
+    methods_per_class: int
+    functions: int
+    statements_per_function: int
+    expression_depth: int
+
+CORPUS = [
+    CorpusSpec("many_classes", 400, 10, 0, 3, 1),
+    CorpusSpec("many_functions", 0, 0, 4000, 3, 1),
+    CorpusSpec("huge_functions", 2, 5, 20, 2000, 1),
+    CorpusSpec("deep_expressions", 1, 2, 10, 5, 1500),
+]
+
+def generate_module(spec: CorpusSpec, scale: float = 1.0) -> str:
+    """Build a synthetic module whose size is controlled by spec, multiplied by scale."""
+    classes = int(spec.classes * scale)
+    functions = int(spec.functions * scale)
+    statements = max(1, int(spec.statements_per_function * scale))
+    deep_expression = " + ".join(["value"] * max(1, spec.expression_depth))
+
+    lines = ["import os", "import re", "from typing import List", ""]
+
+    def body(indent: str) -> None:
+        for index in range(statements):
+            lines.append(f"{indent}value_{index} = value * {index}")
+        lines.append(f"{indent}return {deep_expression}")
+
+    for class_index in range(classes):
+        name = f"Generated{class_index}" if class_index % 7 else f"generated_{class_index}"
+        lines.append(f"class {name}:")
+        lines.append(f'    """Generated class {class_index}."""')
+        for method_index in range(spec.methods_per_class):
+            method = f"method_{method_index}" if method_index % 5 else f"Method{method_index}"
+            lines.append(f"    def {method}(self, value: int) -> int:")
+            body("        ")
+        lines.append("")
+    for function_index in range(functions):
+        name = f"function_{function_index}" if function_index % 9 else f"Function{function_index}"
+        lines.append(f"def {name}(value):")
+        if function_index % 2:
+            lines.append(f'    """Generated function {function_index}."""')
+        body("    ")
+        lines.append("")
+    return "\n".join(lines)
+
+def measure(action: Callable[..., object], setup: Optional[Callable[[], object]] = None) -> Dict[str, float]:
+    """Time one call of action, then call it again under tracemalloc for its peak memory.
+
+    With setup, each call is given a fresh setup() result, built outside the measurement,
+    so state the action accumulates does not carry over between calls.
+    """
+    arguments = (setup(),) if setup else ()
+    # Like timeit, keep the garbage collector from landing a full collection in one phase's time.
+    gc.disable()
+    start = time.perf_counter()
+    try:
+        action(*arguments)
+    except RecursionError as exc:
+        return {"seconds": time.perf_counter() - start, "peak_kib": 0.0, "error": f"RecursionError: {exc}"}
+    finally:
+        elapsed = time.perf_counter() - start
+        gc.enable()
+
+    arguments = (setup(),) if setup else ()
+    tracemalloc.start()
+    action(*arguments)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_kib": peak / 1024}
+
+def bench_functional(source_code: str) -> Dict[str, Dict[str, float]]:
+    results = {"total": measure(lambda: functional.format_report(functional.analyze_source(source_code).sections))}
+    tree = ast.parse(source_code)
+    results["parse"] = measure(lambda: ast.parse(source_code))
+    # Every check runs inside a full walk of the tree, so the walk is timed alone too (see subtract_walk).
+    results["walk"] = measure(lambda: functional.analyze_tree(tree, []))
+    for factory in functional.load_rules():
+        results[factory(source_code).name] = measure(lambda check: functional.analyze_tree(tree, [check]),
+                                                     setup=lambda: factory(source_code))
+    return results
+
+def subtract_walk(phases: Dict[str, Dict[str, float]]) -> None:
+    """Report every functional check net of the empty-check walk it was measured with."""
+    walk = phases["walk"]
+    for phase, numbers in phases.items():
+        if phase not in ("total", "parse", "walk") and "error" not in numbers:
+            numbers["seconds"] = max(0.0, numbers["seconds"] - walk["seconds"])
+            numbers["peak_kib"] = max(0.0, numbers["peak_kib"] - walk["peak_kib"])
+
+def bench_class_based(source_code: str, report_dir: str) -> Dict[str, Dict[str, float]]:
+    file_path = os.path.join(report_dir, "generated.py")
+
+    def full_run() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            PythonStyleChecker(file_path, source=source_code).generate_report()
+
+    results = {"total": measure(full_run)}
+    def new_checker() -> PythonStyleChecker:
+        checker = PythonStyleChecker(file_path, source=source_code)
+        checker.file_content = source_code
+        return checker
+
+    tree = ast.parse(source_code)
+    results["parse"] = measure(lambda: ast.parse(source_code))
+    results["set_parents"] = measure(lambda checker: checker.set_parents(tree), setup=new_checker)
+    for phase in ("check_file_structure", "check_docstrings", "check_type_annotations", "check_naming_conventions"):
+        results[phase] = measure(lambda checker: getattr(checker, phase)(tree), setup=new_checker)
+    return results
+
+def run_benchmarks(scale: float, repeat: int) -> Dict[str, Dict]:
+    results = {}
+    with tempfile.TemporaryDirectory() as report_dir:
+        for spec in CORPUS:
+            source_code = generate_module(spec, scale)
+            runs = [{"functional": bench_functional(source_code),
+                     "class_based": bench_class_based(source_code, report_dir)}
+                    for _ in range(repeat)]
+            best = runs[0]
+            for run in runs[1:]:
+                for checker, phases in run.items():
+                    for phase, numbers in phases.items():
+                        if numbers["seconds"] < best[checker][phase]["seconds"]:
+                            best[checker][phase] = numbers
+            # After picking the fastest runs, so the subtraction is not thrown off by one slow walk.
+            subtract_walk(best["functional"])
+            best["lines"] = source_code.count("\n") + 1
+            results[spec.name] = best
+    return results
+
+def print_results(results: Dict[str, Dict]) -> None:
+    for corpus, data in results.items():
+        print(f"\n{corpus} ({data['lines']} lines)")
+        for checker in ("functional", "class_based"):
+            for phase, numbers in data[checker].items():
+                note = f"  {numbers['error']}" if "error" in numbers else ""
+                print(f"  {checker:<12} {phase:<26} {numbers['seconds'] * 1000:>10.2f} ms {numbers['peak_kib']:>10.0f} KiB{note}")
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    regressions = []
+    for corpus, data in results.items():
+        for checker in ("functional", "class_based"):
+            for phase, numbers in data[checker].items():
+                previous = baseline.get(corpus, {}).get(checker, {}).get(phase)
+                if not previous:
+                    continue
+                if "error" in numbers and "error" not in previous:
+                    regressions.append(f"{corpus}/{checker}/{phase}: now fails with {numbers['error']}")
+                elif numbers["seconds"] > previous["seconds"] * (1 + tolerance):
+                    regressions.append(f"{corpus}/{checker}/{phase}: {previous['seconds'] * 1000:.2f} ms -> "
+                                       f"{numbers['seconds'] * 1000:.2f} ms")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark both style checkers on a synthetic corpus.")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply the size of every generated module")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per module; the fastest is kept")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved earlier with --save")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline")
+    parser.add_argument("--write-corpus", metavar="DIR", help="only write the generated modules to DIR")
+    args = parser.parse_args(argv)
+
+    if args.write_corpus:
+        os.makedirs(args.write_corpus, exist_ok=True)
+        for spec in CORPUS:
+            functional.write_file(os.path.join(args.write_corpus, f"{spec.name}.py"), generate_module(spec, args.scale))
+        return 0
+
+    results = run_benchmarks(args.scale, args.repeat)
+    print_results(results)
+    if args.save:
+        functional.write_file(args.save, json.dumps(results, indent=2))
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
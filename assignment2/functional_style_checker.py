@@ -1,6 +1,105 @@
+import argparse
 import ast
+import bisect
+import hashlib
+import heapq
+import importlib
+import json
+import keyword
+import mmap
 import os
 import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+from importlib.metadata import entry_points
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, TextIO, Tuple, Type, Union
+
+class Check(NamedTuple):
+    name: str
+    title: str
+    node_types: Tuple[Type[ast.AST], ...]
+    visit: Callable[[ast.AST], Optional[str]]
+    summarize: Callable[[], str]
+
+class Finding(NamedTuple):
+    file_path: str
+    line: int
+    column: int
+    rule: str
+    message: str
+
+class Analysis(NamedTuple):
+    sections: List[Tuple[str, str]]
+    findings: List[Tuple[int, int, str, str]]
+
+SCOPE_TYPES = (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+# Phase name -> [seconds, nodes handled]
+Profile = Dict[str, List[float]]
+
+def add_timing(profile: Optional[Profile], phase: str, seconds: float, nodes: int = 0) -> None:
+    if profile is None:
+        return
+    entry = profile.setdefault(phase, [0.0, 0])
+    entry[0] += seconds
+    entry[1] += nodes
+
+def timed_handler(profile: Profile, rule: str, handler: Callable[[ast.AST], Optional[str]]) -> Callable[[ast.AST], Optional[str]]:
+    def wrapper(node: ast.AST) -> Optional[str]:
+        start = time.perf_counter()
+        try:
+            return handler(node)
+        finally:
+            add_timing(profile, f"check:{rule}", time.perf_counter() - start, 1)
+    return wrapper
+
+class CheckVisitor(ast.NodeVisitor):
+    """Walk a tree once and hand each node to every check registered for its type.
+
+    The walk uses an explicit queue rather than recursion, so deeply nested
+    sources cannot hit the recursion limit. Before a node is visited it has
+    `parent` (the node containing it) and `scope` (the nearest enclosing class
+    or function, or None at module level) set.
+
+    A check's visit returns a message when the node is a finding; those are
+    collected as (line, column, rule, message) tuples. When a profile dict is
+    given, the time spent in each check and the nodes it handled are added to it.
+    """
+
+    def __init__(self, checks: List[Check], profile: Optional[Profile] = None):
+        self.handlers: Dict[Type[ast.AST], List[Tuple[str, Callable[[ast.AST], Optional[str]]]]] = {}
+        self.findings: List[Tuple[int, int, str, str]] = []
+        self.nodes = 0
+        for check in checks:
+            handler = timed_handler(profile, check.name, check.visit) if profile is not None else check.visit
+            for node_type in check.node_types:
+                self.handlers.setdefault(node_type, []).append((check.name, handler))
+
+    def visit(self, node: ast.AST) -> None:
+        for rule, handler in self.handlers.get(type(node), ()):
+            message = handler(node)
+            if message:
+                self.findings.append((node.lineno, node.col_offset, rule, message))
+
+    def run(self, tree: ast.AST) -> None:
+        tree.parent = None
+        tree.scope = None
+        todo = deque([tree])
+        while todo:
+            node = todo.popleft()
+            self.nodes += 1
+            self.visit(node)
+            child_scope = node if isinstance(node, SCOPE_TYPES) else node.scope
+            for child in ast.iter_child_nodes(node):
+                child.parent = node
+                child.scope = child_scope
+                todo.append(child)
+
+# What reading and parsing one file can raise; a deeply nested expression makes ast.parse
+# raise RecursionError or MemoryError. Batch runs report these per file instead of aborting.
+FILE_ERRORS = (OSError, SyntaxError, UnicodeDecodeError, ValueError, RecursionError, MemoryError)
 
 def read_file(file_path: str) -> str:
     with open(file_path, 'r') as file:
@@ -10,97 +109,903 @@ def write_file(file_path: str, content: str) -> None:
     with open(file_path, 'w') as output_file:
         output_file.write(content)
 
+def count_lines(source_code: str) -> int:
+    return source_code.count('\n') + (1 if source_code and not source_code.endswith('\n') else 0)
+
+def file_structure_check(source_code: str) -> Check:
+    import_statements: List[str] = []
+    class_definitions: List[str] = []
+    function_definitions: List[str] = []
+
+    def visit(node: ast.AST) -> None:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            import_statements.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ClassDef):
+            class_definitions.append(node.name)
+        elif not isinstance(node.scope, ast.ClassDef):
+            function_definitions.append(node.name)
+
+    def summarize() -> str:
+        structure = [
+            f"Total lines of code: {count_lines(source_code)}",
+            f"Imports: {', '.join(import_statements) if import_statements else 'None'}",
+            f"Classes: {', '.join(class_definitions) if class_definitions else 'None'}",
+            f"Functions: {', '.join(function_definitions) if function_definitions else 'None'}"
+        ]
+        return "\n".join(structure)
+
+    return Check("structure", "File Structure", (ast.Import, ast.ImportFrom, ast.ClassDef, ast.FunctionDef), visit, summarize)
+
+def docstring_check(source_code: str = "") -> Check:
+    docstring_summaries: List[str] = []
+
+    def visit(node: ast.AST) -> Optional[str]:
+        docstring_content = ast.get_docstring(node)
+        if docstring_content:
+            docstring_summaries.append(f"{node.name}: {docstring_content}")
+            return None
+        docstring_summaries.append(f"{node.name}: DocString not found.")
+        return f"{node.name} has no docstring"
+
+    def summarize() -> str:
+        return "\n".join(docstring_summaries)
+
+    return Check("docstrings", "Doc Strings", (ast.FunctionDef, ast.ClassDef), visit, summarize)
+
+def type_annotation_check(source_code: str = "") -> Check:
+    unannotated_functions: List[str] = []
+
+    def visit(node: ast.AST) -> Optional[str]:
+        if not node.returns and not any(arg.annotation for arg in node.args.args):
+            unannotated_functions.append(node.name)
+            return f"{node.name} has no type annotations"
+        return None
+
+    def summarize() -> str:
+        if unannotated_functions:
+            return f"Functions without type annotations: {', '.join(unannotated_functions)}"
+        return "All functions and methods use type annotations."
+
+    return Check("annotations", "Type Annotation Check", (ast.FunctionDef,), visit, summarize)
+
+CAMEL_CASE_REGEX = re.compile(r'^[A-Z][a-zA-Z0-9]*$')
+SNAKE_CASE_REGEX = re.compile(r'^[a-z_][a-z0-9_]*$')
+
+def naming_convention_check(source_code: str = "") -> Check:
+    invalid_class_names: List[str] = []
+    invalid_function_names: List[str] = []
+
+    def visit(node: ast.AST) -> Optional[str]:
+        if isinstance(node, ast.ClassDef):
+            if not CAMEL_CASE_REGEX.match(node.name):
+                invalid_class_names.append(node.name)
+                return f"class {node.name} is not CamelCase"
+        elif not SNAKE_CASE_REGEX.match(node.name):
+            invalid_function_names.append(node.name)
+            return f"function {node.name} is not snake_case"
+        return None
+
+    def summarize() -> str:
+        messages = []
+        if invalid_class_names:
+            messages.append(f"Classes with incorrect naming conventions: {', '.join(invalid_class_names)}")
+        else:
+            messages.append("All class names adhere to the CamelCase naming convention.")
+
+        if invalid_function_names:
+            messages.append(f"Functions with incorrect naming conventions: {', '.join(invalid_function_names)}")
+        else:
+            messages.append("All function and method names adhere to the snake_case naming convention.")
+
+        return "\n".join(messages)
+
+    return Check("naming", "Naming Convention Check", (ast.ClassDef, ast.FunctionDef), visit, summarize)
+
+def analyze_tree(tree: ast.AST, checks: List[Check], profile: Optional[Profile] = None) -> Analysis:
+    visitor = CheckVisitor(checks, profile)
+    start = time.perf_counter()
+    visitor.run(tree)
+    add_timing(profile, "walk", time.perf_counter() - start, visitor.nodes)
+
+    sections = []
+    for check in checks:
+        start = time.perf_counter()
+        sections.append((check.title, check.summarize()))
+        add_timing(profile, f"check:{check.name}", time.perf_counter() - start)
+    return Analysis(sections, visitor.findings)
+
+def run_checks(tree: ast.AST, checks: List[Check]) -> List[Tuple[str, str]]:
+    return analyze_tree(tree, checks).sections
+
 def get_file_structure(tree: ast.Module, file_path: str) -> str:
-    total_lines = sum(1 for _ in open(file_path))
-    import_statements = [node.names[0].name for node in ast.walk(tree) if isinstance(node, (ast.Import, ast.ImportFrom))]
-    class_definitions = [node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
-    function_definitions = [node.name for node in ast.walk(tree)
-                            if isinstance(node, ast.FunctionDef) and not isinstance(getattr(node, 'parent', None), ast.ClassDef)]
-
-    structure = [
-        f"Total lines of code: {total_lines}",
-        f"Imports: {', '.join(import_statements) if import_statements else 'None'}",
-        f"Classes: {', '.join(class_definitions) if class_definitions else 'None'}",
-        f"Functions: {', '.join(function_definitions) if function_definitions else 'None'}"
-    ]
-    return "\n".join(structure)
+    return run_checks(tree, [file_structure_check(read_file(file_path))])[0][1]
 
 def get_docstrings(tree: ast.Module) -> str:
-    docstring_summaries = []
-    for element in ast.walk(tree):
-        if isinstance(element, (ast.FunctionDef, ast.ClassDef)):
-            docstring_content = ast.get_docstring(element)
-            if docstring_content:
-                docstring_summaries.append(f"{element.name}: {docstring_content}")
-            else:
-                docstring_summaries.append(f"{element.name}: DocString not found.")
-    return "\n".join(docstring_summaries)
+    return run_checks(tree, [docstring_check()])[0][1]
 
 def check_type_annotations(tree: ast.Module) -> str:
-    unannotated_functions = [
-        node.name for node in ast.walk(tree)
-        if isinstance(node, ast.FunctionDef) and
-           not node.returns and
-           not any(arg.annotation for arg in node.args.args)
-    ]
-    if unannotated_functions:
-        return f"Functions without type annotations: {', '.join(unannotated_functions)}"
-    return "All functions and methods use type annotations."
+    return run_checks(tree, [type_annotation_check()])[0][1]
 
 def check_naming_conventions(tree: ast.Module) -> str:
-    camel_case_regex = re.compile(r'^[A-Z][a-zA-Z0-9]*$')
-    snake_case_regex = re.compile(r'^[a-z_][a-z0-9_]*$')
+    return run_checks(tree, [naming_convention_check()])[0][1]
 
-    invalid_class_names = [
-        node.name for node in ast.walk(tree)
-        if isinstance(node, ast.ClassDef) and not camel_case_regex.match(node.name)
-    ]
+# A rule factory takes the module source and returns a fresh Check for it.
+RuleFactory = Callable[[str], Check]
 
-    invalid_function_names = [
-        node.name for node in ast.walk(tree)
-        if isinstance(node, ast.FunctionDef) and not snake_case_regex.match(node.name)
-    ]
+RULE_ENTRY_POINT_GROUP = "functional_style_checker.rules"
 
-    messages = []
-    if invalid_class_names:
-        messages.append(f"Classes with incorrect naming conventions: {', '.join(invalid_class_names)}")
-    else:
-        messages.append("All class names adhere to the CamelCase naming convention.")
+DEFAULT_RULES = ["structure", "docstrings", "annotations", "naming"]
 
-    if invalid_function_names:
-        messages.append(f"Functions with incorrect naming conventions: {', '.join(invalid_function_names)}")
-    else:
-        messages.append("All function and method names adhere to the snake_case naming convention.")
+# Rule name -> factory, "module:attribute" import string, or entry point.
+# Anything that is not already a factory is imported the first time the rule is selected.
+RULES: Dict[str, Union[RuleFactory, str, object]] = {
+    "structure": file_structure_check,
+    "docstrings": docstring_check,
+    "annotations": type_annotation_check,
+    "naming": naming_convention_check,
+}
 
-    return "\n".join(messages)
+def register_rule(name: str, factory: Union[RuleFactory, str]) -> None:
+    RULES[name] = factory
 
-def generate_report(file_path: str) -> str:
-    source_code = read_file(file_path)
+def discover_rules(config_path: Optional[str] = None) -> List[str]:
+    """Add rules advertised through entry points and an optional JSON config file.
+
+    The config file looks like {"rules": {"name": "module:factory"}, "select": ["name"]}.
+    Returns the config's "select" list, or the default rules when it has none.
+    """
+    for entry_point in entry_points(group=RULE_ENTRY_POINT_GROUP):
+        RULES.setdefault(entry_point.name, entry_point)
+    if not config_path:
+        return list(DEFAULT_RULES)
+    with open(config_path, "r") as config_file:
+        config = json.load(config_file)
+    for name, spec in config.get("rules", {}).items():
+        register_rule(name, spec)
+    return list(config.get("select", DEFAULT_RULES))
+
+def load_rule(name: str) -> RuleFactory:
+    if name not in RULES:
+        raise ValueError(f"Unknown rule {name!r}; available rules: {', '.join(sorted(RULES))}")
+    spec = RULES[name]
+    if isinstance(spec, str):
+        module_name, _, attribute = spec.partition(":")
+        spec = getattr(importlib.import_module(module_name), attribute)
+    elif hasattr(spec, "load"):
+        spec = spec.load()
+    RULES[name] = spec
+    return spec
+
+def load_rules(names: Optional[List[str]] = None) -> List[RuleFactory]:
+    return [load_rule(name) for name in (DEFAULT_RULES if names is None else names)]
+
+def default_checks(source_code: str, rules: Optional[List[RuleFactory]] = None) -> List[Check]:
+    return [factory(source_code) for factory in (load_rules() if rules is None else rules)]
+
+def analyze_source(source_code: str, profile: Optional[Profile] = None,
+                   rules: Optional[List[RuleFactory]] = None) -> Analysis:
+    start = time.perf_counter()
     parsed_tree = ast.parse(source_code)
+    add_timing(profile, "parse", time.perf_counter() - start)
+    return analyze_tree(parsed_tree, default_checks(source_code, rules), profile)
 
-    def set_parents(node, parent=None):
-        for child in ast.iter_child_nodes(node):
-            child.parent = parent
-            set_parents(child, node)
-
-    set_parents(parsed_tree)
-
-    report_sections = [
-        "File Structure",
-        get_file_structure(parsed_tree, file_path),
-        "\nDoc Strings",
-        get_docstrings(parsed_tree),
-        "\nType Annotation Check",
-        check_type_annotations(parsed_tree),
-        "\nNaming Convention Check",
-        check_naming_conventions(parsed_tree)
-    ]
+def format_report(sections: List[Tuple[str, str]]) -> str:
+    report_sections = []
+    for index, (title, body) in enumerate(sections):
+        report_sections.append(f"\n{title}" if index else title)
+        report_sections.append(body)
     return "\n".join(report_sections)
 
+CHECKER_VERSION = "5"
+
+class ReportCache:
+    """On-disk store of analyses keyed by a hash of the source and checker configuration.
+
+    Entries are individual JSON files; reading one refreshes its mtime so that
+    prune() can evict the least recently used entries once max_entries is exceeded.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 10000, config: str = ""):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.config = config
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key_for(self, source_code: str) -> str:
+        digest = hashlib.sha256(f"{CHECKER_VERSION}\0{self.config}\0".encode())
+        digest.update(source_code.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Analysis]:
+        path = self.entry_path(key)
+        try:
+            with open(path, "r") as entry:
+                data = json.load(entry)
+            analysis = Analysis([tuple(section) for section in data["sections"]],
+                                [tuple(finding) for finding in data["findings"]])
+            os.utime(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return analysis
+
+    def put(self, key: str, analysis: Analysis) -> None:
+        path = self.entry_path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as entry:
+            json.dump({"sections": analysis.sections, "findings": analysis.findings}, entry)
+        os.replace(temp_path, path)
+
+    def prune(self) -> int:
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(".json"):
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return 0
+        entries.sort()
+        for _, path in entries[:excess]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return excess
+
+def analyze_file(file_path: str, cache: Optional[ReportCache] = None, profile: Optional[Profile] = None,
+                 rules: Optional[List[RuleFactory]] = None) -> Analysis:
+    start = time.perf_counter()
+    source_code = read_file(file_path)
+    add_timing(profile, "read", time.perf_counter() - start)
+    if cache is None:
+        return analyze_source(source_code, profile, rules)
+
+    # A profiled run re-analyzes every file, so the profile covers the checks, and refreshes the cache.
+    start = time.perf_counter()
+    key = cache.key_for(source_code)
+    analysis = cache.get(key) if profile is None else None
+    add_timing(profile, "cache", time.perf_counter() - start)
+    if analysis is None:
+        analysis = analyze_source(source_code, profile, rules)
+        start = time.perf_counter()
+        cache.put(key, analysis)
+        add_timing(profile, "cache", time.perf_counter() - start)
+    return analysis
+
+def format_profile(profile: Profile) -> str:
+    lines = []
+    for phase, (seconds, nodes) in profile.items():
+        lines.append(f"{phase}: {seconds * 1000:.3f} ms, {int(nodes)} nodes")
+    return "\n".join(lines)
+
+def generate_report(file_path: str, cache: Optional[ReportCache] = None,
+                    rules: Optional[List[RuleFactory]] = None) -> str:
+    return format_report(analyze_file(file_path, cache, rules=rules).sections)
+
+def report_path_for(file_path: str) -> str:
+    report_file_name = f"style_report_{os.path.basename(file_path).replace('.py', '')}.txt"
+    return os.path.join(os.path.dirname(file_path), report_file_name)
+
+def iter_python_files(paths: Iterable[str]) -> Iterator[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(".py"):
+                        yield os.path.join(root, name)
+        elif path.endswith(".py") and os.path.isfile(path):
+            yield path
+
+class ScanResult(NamedTuple):
+    file_path: str
+    total_lines: int
+    code_lines: int
+    comment_lines: int
+    blank_lines: int
+    imports: List[str]
+    error: Optional[str] = None
+
+LEXEME_REGEX = re.compile(rb"""(?P<quote>'''|\"\"\"|'|") | (?P<comment>\#[^\n]*)""", re.X)
+STRING_END_REGEXES = {
+    b"'''": re.compile(rb"(?:[^\\']|\\.|'(?!''))*'''", re.S),
+    b'"""': re.compile(rb'(?:[^\\"]|\\.|"(?!""))*"""', re.S),
+    b"'": re.compile(rb"(?:[^\\'\n]|\\.)*'", re.S),
+    b'"': re.compile(rb'(?:[^\\"\n]|\\.)*"', re.S),
+}
+NEWLINE_REGEX = re.compile(rb"\n")
+BLANK_LINE_REGEX = re.compile(rb"^(?:\xef\xbb\xbf)?[ \t\f]*\r?$", re.M)
+COMMENT_LINE_REGEX = re.compile(rb"^(?:\xef\xbb\xbf)?[ \t\f]*#", re.M)
+IMPORT_REGEX = re.compile(rb"^(?:\xef\xbb\xbf)?[ \t]*(?:from[ \t]+[\w.]+[ \t]+)?import[ \t]+", re.M)
+INLINE_COMMENT_REGEX = re.compile(rb"#[^\n]*")
+
+def multiline_string_spans(data) -> List[Tuple[int, int]]:
+    """Offsets of the bodies of strings that span several lines, found by skipping from quote to quote."""
+    spans = []
+    position = 0
+    while True:
+        match = LEXEME_REGEX.search(data, position)
+        if not match:
+            return spans
+        if match.lastgroup == "comment":
+            position = match.end()
+            continue
+        end = STRING_END_REGEXES[match.group("quote")].match(data, match.end())
+        if not end:
+            position = match.end()
+            continue
+        if data.find(b"\n", match.end(), end.end()) != -1:
+            spans.append((match.end(), end.end()))
+        position = end.end()
+
+def in_spans(spans: List[Tuple[int, int]], offset: int) -> bool:
+    index = bisect.bisect_right(spans, (offset, sys.maxsize)) - 1
+    return index >= 0 and spans[index][0] <= offset < spans[index][1]
+
+def import_names(data, start: int) -> List[str]:
+    line_end = data.find(b"\n", start)
+    end = len(data) if line_end == -1 else line_end
+    if data[start:end].lstrip().startswith(b"("):
+        end = data.find(b")", start) + 1 or len(data)
+    while data[start:end].rstrip().endswith(b"\\"):
+        line_end = data.find(b"\n", end + 1)
+        end = len(data) if line_end == -1 else line_end
+    statement = INLINE_COMMENT_REGEX.sub(b"", data[start:end]).split(b";")[0]
+    statement = statement.replace(b"(", b" ").replace(b")", b" ").replace(b"\\", b" ")
+    return [item.split()[0].decode() for item in statement.split(b",") if item.split()]
+
+def scan_buffer(data) -> Tuple[int, int, int, List[str]]:
+    """Count total, comment-only and blank lines and collect imports without building an AST.
+
+    The buffer is searched with compiled regular expressions, so the work per line
+    happens in C. The only pure-Python work is per string literal and per import.
+    Lines inside multi-line strings count as code. Imports are found at the start
+    of a line, so `if x: import y` and `x = 1; import y` are not reported.
+    """
+    spans = multiline_string_spans(data)
+    total_lines = len(NEWLINE_REGEX.findall(data)) + (1 if len(data) and data[-1:] != b"\n" else 0)
+    blank_lines = sum(1 for match in BLANK_LINE_REGEX.finditer(data)
+                      if match.start() < len(data) and not in_spans(spans, match.start()))
+    comment_lines = sum(1 for match in COMMENT_LINE_REGEX.finditer(data) if not in_spans(spans, match.start()))
+    imports = []
+    for match in IMPORT_REGEX.finditer(data):
+        if not in_spans(spans, match.start()):
+            imports.extend(import_names(data, match.end()))
+    return total_lines, comment_lines, blank_lines, imports
+
+def scan_file(file_path: str) -> ScanResult:
+    """Line and import statistics for one memory-mapped file."""
+    try:
+        with open(file_path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return ScanResult(file_path, 0, 0, 0, 0, [])
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                total_lines, comment_lines, blank_lines, imports = scan_buffer(mapped)
+    except (OSError, UnicodeDecodeError) as error:
+        return ScanResult(file_path, 0, 0, 0, 0, [], f"{type(error).__name__}: {error}")
+    return ScanResult(file_path, total_lines, total_lines - comment_lines - blank_lines,
+                      comment_lines, blank_lines, imports)
+
+class FileResult(NamedTuple):
+    file_path: str
+    report: Optional[str]
+    error: Optional[str]
+    cached: bool
+    findings: List[Finding]
+    profile: Optional[Profile] = None
+
+def check_file(file_path: str, cache: Optional[ReportCache] = None, profile: bool = False,
+               rules: Optional[List[RuleFactory]] = None) -> FileResult:
+    hits_before = cache.hits if cache else 0
+    timings: Optional[Profile] = {} if profile else None
+    start = time.perf_counter()
+    try:
+        analysis = analyze_file(file_path, cache, timings, rules)
+    except FILE_ERRORS as error:
+        return FileResult(file_path, None, f"{type(error).__name__}: {error}", False, [])
+    add_timing(timings, "total", time.perf_counter() - start)
+
+    report_content = format_report(analysis.sections)
+    if timings is not None:
+        report_content += f"\n\nProfile\n{format_profile(timings)}"
+    findings = [Finding(file_path, *finding) for finding in analysis.findings]
+    return FileResult(file_path, report_content, None,
+                      bool(cache) and cache.hits > hits_before, findings, timings)
+
+class ProfileSummary:
+    """Aggregate per-file profiles from a batch into slowest-file and slowest-phase tables."""
+
+    def __init__(self, top: int = 10):
+        self.top = top
+        self.file_times: List[Tuple[float, str]] = []
+        self.phases: Profile = {}
+
+    def add(self, file_path: str, profile: Profile) -> None:
+        self.file_times.append((profile.get("total", [0.0])[0], file_path))
+        for phase, (seconds, nodes) in profile.items():
+            if phase != "total":
+                add_timing(self.phases, phase, seconds, int(nodes))
+
+    def format(self) -> str:
+        lines = [f"Slowest files (top {self.top}):"]
+        for seconds, file_path in heapq.nlargest(self.top, self.file_times):
+            lines.append(f"  {seconds * 1000:10.3f} ms  {file_path}")
+        lines.append(f"Slowest phases (top {self.top}):")
+        for phase, (seconds, nodes) in heapq.nlargest(self.top, self.phases.items(), key=lambda item: item[1][0]):
+            lines.append(f"  {seconds * 1000:10.3f} ms  {phase} ({int(nodes)} nodes)")
+        return "\n".join(lines)
+
+class JsonLinesWriter:
+    """Write one JSON object per finding as soon as it is handed over."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def write(self, finding: Finding) -> None:
+        self.stream.write(json.dumps(finding._asdict()) + "\n")
+
+    def close(self) -> None:
+        self.stream.flush()
+
+class SarifWriter:
+    """Stream findings into a single SARIF 2.1.0 log without holding them in memory."""
+
+    def __init__(self, stream: TextIO, rules: List[str]):
+        self.stream = stream
+        self.count = 0
+        driver = {
+            "name": "functional_style_checker",
+            "version": CHECKER_VERSION,
+            "rules": [{"id": rule} for rule in rules]
+        }
+        self.stream.write('{"version": "2.1.0", '
+                          '"$schema": "https://json.schemastore.org/sarif-2.1.0.json", '
+                          f'"runs": [{{"tool": {{"driver": {json.dumps(driver)}}}, "results": [')
+
+    def write(self, finding: Finding) -> None:
+        result = {
+            "ruleId": finding.rule,
+            "level": "warning",
+            "message": {"text": finding.message},
+            "locations": [{
+                "physicalLocation": {
+                    "artifactLocation": {"uri": finding.file_path.replace(os.sep, "/")},
+                    "region": {"startLine": finding.line, "startColumn": finding.column + 1}
+                }
+            }]
+        }
+        self.stream.write((",\n" if self.count else "\n") + json.dumps(result))
+        self.count += 1
+
+    def close(self) -> None:
+        self.stream.write("\n]}]}\n")
+        self.stream.flush()
+
+def map_files(function: Callable, file_paths: Iterable[str], jobs: Optional[int] = None, *args) -> Iterator:
+    """Run function(file_path, *args) for every file in a process pool, yielding results as they finish.
+
+    Only a few tasks per worker are in flight at once and each future is dropped
+    once its result is yielded, so memory does not grow with the number of files.
+    """
+    workers = jobs or os.cpu_count()
+    window = workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Set[Future] = set()
+        for file_path in file_paths:
+            pending.add(executor.submit(function, file_path, *args))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
+
+def check_files(file_paths: Iterable[str], jobs: Optional[int] = None, cache: Optional[ReportCache] = None,
+                profile: bool = False, rules: Optional[List[RuleFactory]] = None) -> Iterator[FileResult]:
+    return map_files(check_file, file_paths, jobs, cache, profile, rules)
+
+def run_scan(paths: List[str], jobs: Optional[int] = None) -> None:
+    """Print line counts and imports for every file, lexed with byte regexes rather than the tokenizer."""
+    start = time.perf_counter()
+    scanned = failed = total = code = comments = blank = 0
+    for result in map_files(scan_file, iter_python_files(paths), jobs):
+        if result.error:
+            failed += 1
+            print(f"Skipped {result.file_path}: {result.error}")
+            continue
+        scanned += 1
+        total += result.total_lines
+        code += result.code_lines
+        comments += result.comment_lines
+        blank += result.blank_lines
+        print(f"{result.file_path}: {result.total_lines} lines ({result.code_lines} code, "
+              f"{result.comment_lines} comment, {result.blank_lines} blank); "
+              f"imports: {', '.join(result.imports) if result.imports else 'None'}")
+
+    elapsed = time.perf_counter() - start
+    print(f"\nFiles scanned: {scanned}")
+    print(f"Files skipped: {failed}")
+    print(f"Lines: {total} ({code} code, {comments} comment, {blank} blank)")
+    print(f"Elapsed time: {elapsed:.2f}s")
+
+class FixResult(NamedTuple):
+    file_path: str
+    renames: Dict[str, str]
+    skipped: List[str]
+    error: Optional[str] = None
+
+DEF_KEYWORD_REGEX = re.compile(rb"(?:async\s+)?(?:def|class)\s+")
+WORD_BOUNDARY_REGEX = re.compile(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+
+def to_snake_case(name: str) -> str:
+    stripped = name.lstrip("_")
+    return name[:len(name) - len(stripped)] + WORD_BOUNDARY_REGEX.sub("_", stripped).lower()
+
+def to_camel_case(name: str) -> str:
+    return "".join(part[:1].upper() + part[1:] for part in name.split("_"))
+
+def bound_names(tree: ast.AST) -> Set[str]:
+    """Names bound in tree by anything but a class or def: parameters, imports, assignments, globals and so on."""
+    names: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, ast.alias):
+            names.add(node.asname or node.name.split(".")[0])
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            names.update(node.names)
+        elif isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+            names.add(node.id)
+        elif isinstance(node, ast.keyword) and node.arg is not None:
+            names.add(node.arg)
+        elif isinstance(node, (ast.ExceptHandler, ast.MatchAs, ast.MatchStar)) and node.name is not None:
+            names.add(node.name)
+        elif isinstance(node, ast.MatchMapping) and node.rest is not None:
+            names.add(node.rest)
+    return names
+
+def is_own_attribute(node: ast.Attribute, local_classes: Set[str]) -> bool:
+    """Whether node is read on self, cls or a class defined in the same file."""
+    return isinstance(node.value, ast.Name) and (node.value.id in ("self", "cls") or node.value.id in local_classes)
+
+def external_references(tree: ast.AST) -> Set[str]:
+    """Names tree may take from other modules or look up by name, which --fix must not rename anywhere.
+
+    That is every name imported with `from x import name`, every attribute read on
+    anything but self, cls or a local class, and every identifier in a string
+    constant, which covers __all__ and getattr(obj, "name").
+    """
+    local_classes = {node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)}
+    names: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.Attribute) and not is_own_attribute(node, local_classes):
+            names.add(node.attr)
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            parts = node.value.split(".")
+            if all(part.isidentifier() for part in parts):
+                names.update(parts)
+    return names
+
+def file_references(file_path: str) -> Set[str]:
+    """external_references of one file, or nothing if it cannot be parsed (fix_file reports that)."""
+    try:
+        return external_references(ast.parse(read_file(file_path)))
+    except FILE_ERRORS:
+        return set()
+
+def naming_fixes(tree: ast.AST, protected: Iterable[str] = ()) -> Tuple[Dict[str, str], List[str]]:
+    """Map every misnamed class and function in tree to its conventional name.
+
+    Methods of classes that inherit from a class defined elsewhere are left alone,
+    since they may override an API such as NodeVisitor.visit_Name. So are names
+    in protected (the external_references of every file being fixed) or in this
+    file's own external_references: other code imports them or looks them up as
+    attributes or strings. References are renamed by name, not by scope, so a
+    rename is skipped when the old name is also bound some other way anywhere in
+    the file (a parameter, an import, an assignment, a global), or when the new
+    name is already used in the file.
+    """
+    protected = set(protected) | external_references(tree)
+    local_classes = {node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)}
+    other_bindings = bound_names(tree)
+    used_names = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)} | other_bindings
+    used_names |= {node.name for node in ast.walk(tree) if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef))}
+    renames: Dict[str, str] = {}
+    skipped: List[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef) and not CAMEL_CASE_REGEX.match(node.name):
+            new_name = to_camel_case(node.name)
+            valid = CAMEL_CASE_REGEX.match(new_name)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and not SNAKE_CASE_REGEX.match(node.name):
+            scope = node.scope
+            if isinstance(scope, ast.ClassDef) and any(
+                    not (isinstance(base, ast.Name) and base.id in local_classes | {"object"}) for base in scope.bases):
+                skipped.append(f"{scope.name}.{node.name} (inherited API)")
+                continue
+            new_name = to_snake_case(node.name)
+            valid = SNAKE_CASE_REGEX.match(new_name)
+        else:
+            continue
+        if node.name in renames:
+            continue
+        if node.name in protected:
+            skipped.append(f"{node.name} (imported, used as an attribute or named in a string)")
+            continue
+        if node.name in other_bindings:
+            skipped.append(f"{node.name} (also bound as a variable, parameter or import)")
+            continue
+        if not valid or new_name in used_names or keyword.iskeyword(new_name):
+            skipped.append(f"{node.name} (cannot rename to {new_name})")
+            continue
+        renames[node.name] = new_name
+        used_names.add(new_name)
+    return renames, skipped
+
+def rename_source(source_code: str, tree: ast.AST, renames: Dict[str, str]) -> str:
+    """Apply every rename at the positions the AST reports, in a single pass over the source."""
+    data = source_code.encode("utf-8")
+    line_starts = [0] + [match.end() for match in NEWLINE_REGEX.finditer(data)]
+    method_names = {node.name for node in ast.walk(tree)
+                    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and isinstance(node.scope, ast.ClassDef)}
+    local_classes = {node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)}
+    edits: List[Tuple[int, int, str]] = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) and node.name in renames:
+            start = DEF_KEYWORD_REGEX.match(data, line_starts[node.lineno - 1] + node.col_offset).end()
+            edits.append((start, len(node.name.encode("utf-8")), renames[node.name]))
+        elif isinstance(node, ast.Name) and node.id in renames:
+            edits.append((line_starts[node.lineno - 1] + node.col_offset, len(node.id.encode("utf-8")), renames[node.id]))
+        elif (isinstance(node, ast.Attribute) and node.attr in renames and node.attr in method_names
+              and is_own_attribute(node, local_classes)):
+            length = len(node.attr.encode("utf-8"))
+            edits.append((line_starts[node.end_lineno - 1] + node.end_col_offset - length, length, renames[node.attr]))
+
+    pieces = []
+    position = 0
+    for start, length, new_name in sorted(edits):
+        pieces.append(data[position:start])
+        pieces.append(new_name.encode("utf-8"))
+        position = start + length
+    pieces.append(data[position:])
+    return b"".join(pieces).decode("utf-8")
+
+def fix_file(file_path: str, protected: Iterable[str] = ()) -> FixResult:
+    """Rename misnamed classes and functions and their references in file_path, writing it once."""
+    try:
+        with open(file_path, "r", newline="") as file:
+            source_code = file.read()
+        tree = ast.parse(source_code)
+        CheckVisitor([]).run(tree)
+        renames, skipped = naming_fixes(tree, protected)
+        if renames:
+            with open(file_path, "w", newline="") as file:
+                file.write(rename_source(source_code, tree, renames))
+    except FILE_ERRORS as error:
+        return FixResult(file_path, {}, [], f"{type(error).__name__}: {error}")
+    return FixResult(file_path, renames, skipped)
+
+def run_fix(paths: List[str], jobs: Optional[int] = None) -> None:
+    """Fix naming conventions in every file under paths in parallel.
+
+    A first pass collects the names any of the files imports or looks up by name,
+    so that a rename in one file cannot break another.
+    """
+    start = time.perf_counter()
+    fixed = failed = renamed = 0
+    file_paths = list(iter_python_files(paths))
+    protected: Set[str] = set()
+    for names in map_files(file_references, file_paths, jobs):
+        protected |= names
+    for result in map_files(fix_file, file_paths, jobs, frozenset(protected)):
+        if result.error:
+            failed += 1
+            print(f"Skipped {result.file_path}: {result.error}")
+            continue
+        for old_name, new_name in result.renames.items():
+            print(f"{result.file_path}: {old_name} -> {new_name}")
+        for name in result.skipped:
+            print(f"{result.file_path}: left {name}")
+        fixed += bool(result.renames)
+        renamed += len(result.renames)
+
+    elapsed = time.perf_counter() - start
+    print(f"\nFiles fixed: {fixed}")
+    print(f"Files skipped: {failed}")
+    print(f"Names changed: {renamed}")
+    print(f"Elapsed time: {elapsed:.2f}s")
+
+def run_batch(paths: List[str], jobs: Optional[int] = None, cache: Optional[ReportCache] = None,
+              writer=None, log: TextIO = sys.stdout, profile: Optional[ProfileSummary] = None,
+              rules: Optional[List[RuleFactory]] = None) -> None:
+    """Check every file under paths, writing text reports or, when a writer is given, its findings."""
+    start = time.perf_counter()
+    checked = failed = hits = findings = 0
+    for result in check_files(iter_python_files(paths), jobs, cache, profile is not None, rules):
+        if result.error:
+            failed += 1
+            print(f"Skipped {result.file_path}: {result.error}", file=log)
+            continue
+        checked += 1
+        hits += result.cached
+        if profile is not None:
+            profile.add(result.file_path, result.profile)
+        if writer:
+            for finding in result.findings:
+                writer.write(finding)
+            findings += len(result.findings)
+            continue
+        report_file_path = report_path_for(result.file_path)
+        write_file(report_file_path, result.report)
+        print(f"Report generated and saved to {report_file_path}", file=log)
+
+    if writer:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    print(f"\nFiles checked: {checked}", file=log)
+    print(f"Files skipped: {failed}", file=log)
+    if writer:
+        print(f"Findings: {findings}", file=log)
+    if cache:
+        cache.prune()
+        print(f"Cache hits: {hits}, misses: {checked - hits}", file=log)
+    print(f"Elapsed time: {elapsed:.2f}s", file=log)
+    if profile is not None:
+        print(f"\n{profile.format()}", file=log)
+
+def report_import_cycles(db_path: str, paths: List[str], jobs: Optional[int] = None,
+                         log: TextIO = sys.stdout) -> None:
+    from symbol_index import SymbolIndex, format_cycles
+
+    index = SymbolIndex(db_path)
+    try:
+        updated, removed, _ = index.update(paths, jobs)
+        print(f"\nSymbol index: {updated} files updated, {removed} removed", file=log)
+        print(f"\nImport Cycles\n{format_cycles(index.import_cycles())}", file=log)
+    finally:
+        index.close()
+
+def snapshot_mtimes(paths: List[str]) -> Dict[str, int]:
+    mtimes = {}
+    for file_path in iter_python_files(paths):
+        try:
+            mtimes[file_path] = os.stat(file_path).st_mtime_ns
+        except OSError:
+            pass
+    return mtimes
+
+def record_result(index: Dict[str, FileResult], result: FileResult) -> None:
+    index[result.file_path] = result
+    if result.error:
+        print(f"Skipped {result.file_path}: {result.error}")
+        return
+    report_file_path = report_path_for(result.file_path)
+    write_file(report_file_path, result.report)
+    print(f"Report generated and saved to {report_file_path}")
+
+def summarize_index(index: Dict[str, FileResult]) -> str:
+    failed = sorted(file_path for file_path, result in index.items() if result.error)
+    summary = [f"Files indexed: {len(index)}", f"Files with errors: {len(failed)}"]
+    summary.extend(f"  {file_path}" for file_path in failed)
+    return "\n".join(summary)
+
+def watch(paths: List[str], interval: float = 1.0, debounce: float = 0.5, jobs: Optional[int] = None,
+          cache: Optional[ReportCache] = None, rules: Optional[List[RuleFactory]] = None) -> Dict[str, FileResult]:
+    """Re-check files as they change, keeping the latest result for every file in memory.
+
+    Changes are collected until no file has been modified for `debounce`
+    seconds, then only the modified files are checked again.
+    """
+    mtimes = snapshot_mtimes(paths)
+    index: Dict[str, FileResult] = {}
+    for result in check_files(mtimes, jobs, cache, rules=rules):
+        record_result(index, result)
+    print(summarize_index(index))
+
+    pending = set()
+    last_change = 0.0
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot_mtimes(paths)
+            changed = {file_path for file_path, mtime in current.items() if mtimes.get(file_path) != mtime}
+            for file_path in mtimes.keys() - current.keys():
+                index.pop(file_path, None)
+                pending.discard(file_path)
+            mtimes = current
+            if changed:
+                pending |= changed
+                last_change = time.monotonic()
+                continue
+            if pending and time.monotonic() - last_change >= debounce:
+                for file_path in sorted(pending):
+                    record_result(index, check_file(file_path, cache, rules=rules))
+                pending.clear()
+                print(summarize_index(index))
+    except KeyboardInterrupt:
+        pass
+    return index
+
 def sanitize_file_path(raw_path: str) -> str:
     return raw_path.strip('"').strip("'")
 
-def main() -> None:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Functional Python style checker.")
+    parser.add_argument("paths", nargs="*", help="files or directories to check, or - to read paths from stdin")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--cache-dir", default=".style_checker_cache", help="directory for cached results")
+    parser.add_argument("--cache-size", type=int, default=10000, help="maximum number of cached files")
+    parser.add_argument("--no-cache", action="store_true", help="always re-analyze every file")
+    parser.add_argument("--format", choices=["text", "jsonl", "sarif"], default="text",
+                        help="text writes a report next to each file; jsonl and sarif stream findings to --output")
+    parser.add_argument("-o", "--output", default="-", help="findings file for jsonl/sarif output (default: stdout)")
+    parser.add_argument("--scan", action="store_true",
+                        help="only count lines and list imports with regexes over the raw bytes; skips tokenizing and the AST checks")
+    parser.add_argument("--fix", action="store_true",
+                        help="rename misnamed classes and functions and their references within each file")
+    parser.add_argument("--select", help="comma-separated rules to run (default: all built-in rules)")
+    parser.add_argument("--rules-config", help="JSON file registering extra rules and a default selection")
+    parser.add_argument("--profile", action="store_true", help="record time and node counts per phase and check; cached results are not reused")
+    parser.add_argument("--top", type=int, default=10, help="rows in the --profile summary tables")
+    parser.add_argument("--index", metavar="DB",
+                        help="update the symbol index in DB and report import cycles across the checked files")
+    parser.add_argument("--watch", action="store_true", help="keep running and re-check files when they change")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between polls in watch mode")
+    parser.add_argument("--debounce", type=float, default=0.5, help="quiet period before re-checking in watch mode")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.paths:
+        paths = args.paths
+        if paths == ["-"]:
+            paths = [line.strip() for line in sys.stdin if line.strip()]
+        if args.scan:
+            run_scan(paths, args.jobs)
+            return
+        if args.fix:
+            run_fix(paths, args.jobs)
+            return
+        selected = discover_rules(args.rules_config)
+        if args.select:
+            selected = [name.strip() for name in args.select.split(",") if name.strip()]
+        try:
+            rules = load_rules(selected)
+        except (ImportError, AttributeError, ValueError) as error:
+            print(f"Could not load rules: {error}")
+            return
+        cache = None
+        if not args.no_cache:
+            config = ",".join(f"{name}={factory.__module__}.{factory.__qualname__}" for name, factory in zip(selected, rules))
+            cache = ReportCache(args.cache_dir, args.cache_size, config)
+        profile = ProfileSummary(args.top) if args.profile else None
+        if args.watch:
+            watch(paths, args.interval, args.debounce, args.jobs, cache, rules)
+        elif args.format == "text":
+            run_batch(paths, args.jobs, cache, profile=profile, rules=rules)
+        else:
+            stream = sys.stdout if args.output == "-" else open(args.output, "w")
+            try:
+                if args.format == "jsonl":
+                    writer = JsonLinesWriter(stream)
+                else:
+                    writer = SarifWriter(stream, selected)
+                run_batch(paths, args.jobs, cache, writer, log=sys.stderr, profile=profile, rules=rules)
+            finally:
+                if stream is not sys.stdout:
+                    stream.close()
+        if args.index and not args.watch:
+            report_import_cycles(args.index, paths, args.jobs, sys.stdout if args.format == "text" else sys.stderr)
+        return
+
     raw_file_path = input("Enter the path to the Python file: ").strip()
     file_path = sanitize_file_path(raw_file_path)
 
@@ -110,8 +1015,7 @@ def main() -> None:
 
     report_content = generate_report(file_path)
 
-    report_file_name = f"style_report_{os.path.basename(file_path).replace('.py', '')}.txt"
-    report_file_path = os.path.join(os.path.dirname(file_path), report_file_name)
+    report_file_path = report_path_for(file_path)
     write_file(report_file_path, report_content)
 
     print(f"Report generated and saved to {report_file_path}")
@@ -0,0 +1,271 @@
+import argparse
+import ast
+import os
+import sqlite3
+import sys
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import functional_style_checker as checker
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS modules (
+    path TEXT PRIMARY KEY,
+    module TEXT NOT NULL,
+    mtime INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT NOT NULL,
+    imported TEXT NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS modules_module ON modules (module);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols (name);
+CREATE INDEX IF NOT EXISTS symbols_path ON symbols (path);
+CREATE INDEX IF NOT EXISTS imports_imported ON imports (imported);
+CREATE INDEX IF NOT EXISTS imports_path ON imports (path);
+"""
+
+SYMBOL_NODE_TYPES = (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef, ast.Import, ast.ImportFrom)
+
+class ModuleSymbols(NamedTuple):
+    path: str
+    module: str
+    mtime: int
+    size: int
+    symbols: List[Tuple[str, str, int]]
+    imports: List[Tuple[str, int]]
+    error: Optional[str] = None
+
+def module_name(file_path: str) -> str:
+    """The dotted name Python imports file_path by: its packages (directories with an __init__.py) and itself.
+
+    It depends only on where the file is, not on the path it was indexed through.
+    """
+    directory, file_name = os.path.split(os.path.abspath(file_path))
+    parts = [] if file_name == "__init__.py" else [file_name[:-len(".py")]]
+    if not parts:
+        directory, package = os.path.split(directory)
+        parts.append(package)
+    while os.path.isfile(os.path.join(directory, "__init__.py")):
+        directory, package = os.path.split(directory)
+        parts.append(package)
+    return ".".join(reversed(parts))
+
+def is_under(path: str, roots: List[str]) -> bool:
+    return any(path == root or path.startswith(root.rstrip(os.sep) + os.sep) for root in roots)
+
+def resolve_import_from(module: str, is_package: bool, node: ast.ImportFrom) -> str:
+    if not node.level:
+        return node.module or ""
+    package = module.split(".") if is_package else module.split(".")[:-1]
+    if node.level > 1:
+        package = package[:len(package) - (node.level - 1)]
+    return ".".join(package + ([node.module] if node.module else []))
+
+def extract_symbols(source_code: str, module: str, is_package: bool = False) -> Tuple[List[Tuple[str, str, int]], List[Tuple[str, int]]]:
+    """Collect (kind, name, line) definitions and (module, line) imports in one walk of the tree.
+
+    Methods are named Class.method. `from x import y` records x.y, which the
+    import graph resolves to x when y is not an indexed module.
+    """
+    symbols: List[Tuple[str, str, int]] = []
+    imports: List[Tuple[str, int]] = []
+
+    def visit(node: ast.AST) -> None:
+        if isinstance(node, ast.ClassDef):
+            symbols.append(("class", node.name, node.lineno))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if isinstance(node.scope, ast.ClassDef):
+                symbols.append(("method", f"{node.scope.name}.{node.name}", node.lineno))
+            else:
+                symbols.append(("function", node.name, node.lineno))
+        elif isinstance(node, ast.Import):
+            imports.extend((alias.name, node.lineno) for alias in node.names)
+        else:
+            base = resolve_import_from(module, is_package, node)
+            if base and all(alias.name == "*" for alias in node.names):
+                imports.append((base, node.lineno))
+            imports.extend((f"{base}.{alias.name}" if base else alias.name, node.lineno)
+                           for alias in node.names if alias.name != "*")
+
+    check = checker.Check("symbols", "Symbols", SYMBOL_NODE_TYPES, visit, lambda: "")
+    checker.CheckVisitor([check]).run(ast.parse(source_code))
+    return symbols, imports
+
+def index_file(file_path: str) -> ModuleSymbols:
+    module = module_name(file_path)
+    try:
+        stat = os.stat(file_path)
+        symbols, imports = extract_symbols(checker.read_file(file_path), module,
+                                           os.path.basename(file_path) == "__init__.py")
+    except checker.FILE_ERRORS as error:
+        return ModuleSymbols(file_path, module, 0, 0, [], [], f"{type(error).__name__}: {error}")
+    return ModuleSymbols(file_path, module, stat.st_mtime_ns, stat.st_size, symbols, imports)
+
+def find_cycles(graph: Dict[str, Set[str]]) -> List[List[str]]:
+    """Strongly connected components with more than one module (or a self-import), via iterative Tarjan."""
+    index_of: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    cycles = []
+    for start in sorted(graph):
+        if start in index_of:
+            continue
+        work = [(start, iter(sorted(graph[start])))]
+        index_of[start] = low[start] = len(index_of)
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, children = work[-1]
+            child = next(children, None)
+            if child is not None:
+                if child not in index_of:
+                    index_of[child] = low[child] = len(index_of)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(sorted(graph.get(child, ())))))
+                elif child in on_stack:
+                    low[node] = min(low[node], index_of[child])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1 or node in graph.get(node, ()):
+                    cycles.append(sorted(component))
+    return cycles
+
+class SymbolIndex:
+    """Symbols and imports of every indexed module, kept in SQLite and refreshed only for changed files."""
+
+    def __init__(self, db_path: str):
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def update(self, paths: List[str], jobs: Optional[int] = None) -> Tuple[int, int, List[str]]:
+        """Re-index files under paths whose mtime or size changed and forget deleted ones.
+
+        Files are stored by absolute path, so the index can be updated from any
+        directory; only files under paths are ever forgotten. Returns (files
+        re-indexed, files removed, errors).
+        """
+        known = {path: (mtime, size) for path, mtime, size in
+                 self.connection.execute("SELECT path, mtime, size FROM modules")}
+        roots = [os.path.abspath(root) for root in paths]
+        changed = []
+        for file_path in checker.iter_python_files(roots):
+            file_path = os.path.abspath(file_path)
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            if known.get(file_path) != (stat.st_mtime_ns, stat.st_size):
+                changed.append(file_path)
+        # Relative paths were stored by earlier versions; they are re-indexed under their absolute path.
+        removed = [path for path in known
+                   if not os.path.isabs(path) or (is_under(path, roots) and not os.path.exists(path))]
+
+        errors = []
+        with self.connection:
+            for path in removed:
+                self.forget(path)
+            for result in checker.map_files(index_file, changed, jobs):
+                self.forget(result.path)
+                if result.error:
+                    errors.append(f"{result.path}: {result.error}")
+                    continue
+                self.connection.execute("INSERT INTO modules VALUES (?, ?, ?, ?)",
+                                        (result.path, result.module, result.mtime, result.size))
+                self.connection.executemany("INSERT INTO symbols VALUES (?, ?, ?, ?)",
+                                            [(result.path, *symbol) for symbol in result.symbols])
+                self.connection.executemany("INSERT INTO imports VALUES (?, ?, ?)",
+                                            [(result.path, *imported) for imported in result.imports])
+        return len(changed), len(removed), errors
+
+    def forget(self, path: str) -> None:
+        for table in ("modules", "symbols", "imports"):
+            self.connection.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+
+    def importers(self, module: str) -> List[Tuple[str, int]]:
+        """Modules that import module or anything inside it, with the line of the import."""
+        return self.connection.execute(
+            "SELECT DISTINCT modules.module, imports.line FROM imports JOIN modules USING (path) "
+            "WHERE imports.imported = ? OR imports.imported LIKE ? ESCAPE '\\' ORDER BY 1, 2",
+            (module, module.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + ".%")).fetchall()
+
+    def definitions(self, name: str) -> List[Tuple[str, str, str, str, int]]:
+        """Where name (a class, function or Class.method) is defined: (module, path, kind, name, line)."""
+        return self.connection.execute(
+            "SELECT modules.module, path, kind, symbols.name, line FROM symbols JOIN modules USING (path) "
+            "WHERE symbols.name = ? ORDER BY 1, 5", (name,)).fetchall()
+
+    def import_graph(self) -> Dict[str, Set[str]]:
+        modules = {module for module, in self.connection.execute("SELECT module FROM modules")}
+        graph: Dict[str, Set[str]] = {module: set() for module in modules}
+        rows = self.connection.execute("SELECT modules.module, imports.imported FROM imports JOIN modules USING (path)")
+        for module, imported in rows:
+            # `import a.b.c` depends on the deepest indexed package or module in the dotted name.
+            while imported and imported not in modules:
+                imported = imported.rpartition(".")[0]
+            # `from . import sub` in pkg/__init__.py resolves to pkg itself when sub is not indexed.
+            if imported and imported != module:
+                graph[module].add(imported)
+        return graph
+
+    def import_cycles(self) -> List[List[str]]:
+        return find_cycles(self.import_graph())
+
+def format_cycles(cycles: List[List[str]]) -> str:
+    if not cycles:
+        return "No import cycles found."
+    return "\n".join(" <-> ".join(cycle) for cycle in cycles)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Query the project-wide symbol index.")
+    parser.add_argument("paths", nargs="*", help="files or directories to (re-)index before querying")
+    parser.add_argument("--db", default=".style_checker_index.sqlite", help="index database file")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--importers", metavar="MODULE", help="list modules that import MODULE")
+    parser.add_argument("--where", metavar="NAME", help="show where a class, function or Class.method is defined")
+    parser.add_argument("--cycles", action="store_true", help="report import cycles")
+    args = parser.parse_args(argv)
+
+    index = SymbolIndex(args.db)
+    try:
+        if args.paths:
+            updated, removed, errors = index.update(args.paths, args.jobs)
+            for error in errors:
+                print(f"Skipped {error}")
+            print(f"Indexed {updated} changed files, removed {removed}.")
+        if args.importers:
+            for module, line in index.importers(args.importers):
+                print(f"{module}:{line}")
+        if args.where:
+            for module, path, kind, name, line in index.definitions(args.where):
+                print(f"{kind} {name} in {module} ({path}:{line})")
+        if args.cycles:
+            print(f"Import Cycles\n{format_cycles(index.import_cycles())}")
+    finally:
+        index.close()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
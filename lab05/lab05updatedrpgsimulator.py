@@ -1,8 +1,12 @@
+import sys
+
 class Item:
+    __slots__ = ('name', 'description', 'rarity', '_ownership')
+
     def __init__(self, name, description='', rarity='common'):
         self.name = name
         self.description = description
-        self.rarity = rarity
+        self.rarity = sys.intern(rarity)
         self._ownership = None
 
     def pick_up(self, character: str):
@@ -30,6 +34,8 @@ class Item:
 
 
 class Weapon(Item):
+    __slots__ = ('damage', 'type', 'active')
+
     rarity_modifiers = {
         'common': 1.0,
         'uncommon': 1.0,
@@ -40,7 +46,7 @@ class Weapon(Item):
     def __init__(self, name, damage, type, description='', rarity='common'):
         super().__init__(name, rarity=rarity)
         self.damage = damage
-        self.type = type
+        self.type = sys.intern(type)
         self.active = False
 
     def equip(self):
@@ -58,23 +64,33 @@ class Weapon(Item):
 
 
 class SingleHandedWeapon(Weapon):
+    __slots__ = ()
+
     def attack_move(self):
         return f'{self._ownership} slashes with {self.name}'
 
 class DoubleHandedWeapon(Weapon):
+    __slots__ = ()
+
     def attack_move(self):
         return f'{self._ownership} spins {self.name} powerfully'
 
 class Pike(Weapon):
+    __slots__ = ()
+
     def attack_move(self):
         return f'{self._ownership} thrusts forward with {self.name}'
 
 class RangedWeapon(Weapon):
+    __slots__ = ()
+
     def attack_move(self):
         return f'{self._ownership} shoots an arrow from {self.name}'
 
 
 class Shield(Item):
+    __slots__ = ('defense', 'broken', 'active')
+
     rarity_modifiers = {
         'common': 1.0,
         'uncommon': 1.0,
@@ -101,6 +117,8 @@ class Shield(Item):
 
 
 class Clothes(Item):
+    __slots__ = ('armor', 'active')
+
     def __init__(self, name, description='', armor=0, rarity='common'):
         super().__init__(name, description, rarity)
         self.armor = armor
@@ -122,9 +140,11 @@ class Clothes(Item):
 
 
 class Potion(Item):
+    __slots__ = ('potion_type', 'value', 'effective_time', 'empty')
+
     def __init__(self, name, potion_type, value, effective_time=0, rarity='common'):
         super().__init__(name, rarity=rarity)
-        self.potion_type = potion_type
+        self.potion_type = sys.intern(potion_type)
         self.value = value
         self.effective_time = effective_time
         self.empty = False
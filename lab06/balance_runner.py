@@ -0,0 +1,130 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Tuple
+
+from battle_simulation import Battle, Combatant, make_inventory
+from rpgserialization import Shield, Weapon
+
+class Configuration(NamedTuple):
+    weapon_modifiers: Dict[str, float]
+    shield_modifiers: Dict[str, float]
+
+    def label(self) -> str:
+        return f"weapon {self.weapon_modifiers['legendary']:.2f} / shield {self.shield_modifiers['legendary']:.2f}"
+
+class FightResult(NamedTuple):
+    winner: int
+    legendary_damage: float
+    other_damage: float
+    simulated_time: float
+
+def run_fight(configuration: Configuration, seed: str, size: int, health: float, against: str,
+              max_time: float = 600.0) -> FightResult:
+    """
+    One skirmish: a team equipped with legendary items against a team of against-rarity items.
+
+    Base damage, defense and turn speed are drawn from the same distributions for
+    both teams, so the outcome only depends on the rarity modifiers being tested.
+    The seed fixes the whole fight, so every configuration sees the same armies.
+    A fight still undecided after max_time simulated seconds, or stalemated, is a draw.
+    """
+    rng = random.Random(seed)
+    combatants = []
+    for team, rarity in enumerate(('legendary', against)):
+        for index in range(size):
+            inventory = make_inventory(rng, f'Team {team} #{index}', rarity)
+            combatants.append(Combatant.from_inventory(inventory, team, health, rng.uniform(0.8, 1.2),
+                                                       configuration.weapon_modifiers,
+                                                       configuration.shield_modifiers))
+    report = Battle(combatants, seed=rng.randrange(2 ** 32)).run(until=max_time)
+    winner = -1 if report.winner is None else report.winner
+    return FightResult(winner, report.damage_by_team[0], report.damage_by_team[1], report.simulated_time)
+
+def run_fights(index: int, configuration: Configuration, seeds: List[str], size: int, health: float,
+               against: str, max_time: float) -> Tuple[int, List[FightResult]]:
+    return index, [run_fight(configuration, seed, size, health, against, max_time) for seed in seeds]
+
+def summarize(results: List[FightResult]) -> Dict[str, float]:
+    damage = [result.legendary_damage for result in results]
+    deciles = statistics.quantiles(damage, n=10) if len(damage) > 1 else damage * 9
+    return {
+        'fights': len(results),
+        'win_rate': sum(result.winner == 0 for result in results) / len(results),
+        'draw_rate': sum(result.winner == -1 for result in results) / len(results),
+        'damage_mean': statistics.fmean(damage),
+        'damage_stdev': statistics.stdev(damage) if len(damage) > 1 else 0.0,
+        'damage_p10': deciles[0],
+        'damage_p50': deciles[4],
+        'damage_p90': deciles[8],
+        'damage_ratio': sum(damage) / max(sum(result.other_damage for result in results), 1e-9),
+        'battle_length': statistics.fmean(result.simulated_time for result in results),
+    }
+
+def sweep(configurations: List[Configuration], fights: int, size: int, health: float, against: str,
+          seed: int, jobs: int = None, chunk: int = 20, max_time: float = 600.0) -> List[Dict[str, float]]:
+    """Run fights fights for every configuration across a process pool and summarize each configuration."""
+    seeds = [f'{seed}-{fight}' for fight in range(fights)]
+    results: Dict[int, List[FightResult]] = {index: [] for index in range(len(configurations))}
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        futures = [executor.submit(run_fights, index, configuration, seeds[start:start + chunk], size, health, against,
+                                   max_time)
+                   for index, configuration in enumerate(configurations)
+                   for start in range(0, fights, chunk)]
+        for future in as_completed(futures):
+            index, chunk_results = future.result()
+            results[index].extend(chunk_results)
+    return [summarize(results[index]) for index in range(len(configurations))]
+
+def parse_values(text: str) -> List[float]:
+    return [float(value) for value in text.split(',') if value.strip()]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep legendary rarity modifiers with simulated fights.")
+    parser.add_argument("--weapon-legendary", type=parse_values, default=[1.0, 1.05, 1.10, 1.15, 1.20, 1.25],
+                        help="comma-separated legendary weapon modifiers to try")
+    parser.add_argument("--shield-legendary", type=parse_values, default=[1.0, 1.10, 1.20],
+                        help="comma-separated legendary shield modifiers to try")
+    parser.add_argument("--against", default='epic', help="rarity of the opposing team's items")
+    parser.add_argument("--fights", type=int, default=200, help="fights per configuration")
+    parser.add_argument("--size", type=int, default=20, help="characters per team")
+    parser.add_argument("--health", type=float, default=300.0, help="starting health of every character")
+    parser.add_argument("--max-time", type=float, default=600.0,
+                        help="simulated seconds after which an undecided fight counts as a draw")
+    parser.add_argument("--seed", type=int, default=0, help="seed; the same fights are replayed for every configuration")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--chunk", type=int, default=20, help="fights per task sent to a worker")
+    parser.add_argument("--json", metavar="FILE", help="also write the summaries to FILE")
+    args = parser.parse_args(argv)
+
+    configurations = [Configuration({**Weapon.rarity_modifiers, 'legendary': weapon},
+                                    {**Shield.rarity_modifiers, 'legendary': shield})
+                      for weapon, shield in itertools.product(args.weapon_legendary, args.shield_legendary)]
+    start = time.perf_counter()
+    summaries = sweep(configurations, args.fights, args.size, args.health, args.against, args.seed,
+                      args.jobs, args.chunk, args.max_time)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'configuration':<28} {'win rate':>8} {'draws':>6} {'damage mean':>12} {'stdev':>9} "
+          f"{'p10':>9} {'p50':>9} {'p90':>9} {'ratio':>6}")
+    for configuration, summary in zip(configurations, summaries):
+        print(f"{configuration.label():<28} {summary['win_rate']:>8.1%} {summary['draw_rate']:>6.1%} "
+              f"{summary['damage_mean']:>12.1f} {summary['damage_stdev']:>9.1f} {summary['damage_p10']:>9.1f} "
+              f"{summary['damage_p50']:>9.1f} {summary['damage_p90']:>9.1f} {summary['damage_ratio']:>6.2f}")
+    print(f"\n{len(configurations) * args.fights} fights of {args.size} vs {args.size} (legendary vs {args.against}) "
+          f"in {elapsed:.2f}s")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump([{'weapon_modifiers': configuration.weapon_modifiers,
+                        'shield_modifiers': configuration.shield_modifiers, **summary}
+                       for configuration, summary in zip(configurations, summaries)], f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
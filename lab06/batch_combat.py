@@ -0,0 +1,133 @@
+import argparse
+import sys
+import time
+from array import array
+
+try:
+    import numpy
+except ImportError:  # the batch functions fall back to flat arrays and one pass each
+    numpy = None
+
+from rpgserialization import Pike, Shield, SingleHandedWeapon, Weapon
+
+RARITIES = ('common', 'uncommon', 'epic', 'legendary')
+RARITY_CODES = {rarity: code for code, rarity in enumerate(RARITIES)}
+WEAPON_MODIFIERS = tuple(Weapon.rarity_modifiers[rarity] for rarity in RARITIES)
+SHIELD_MODIFIERS = tuple(Shield.rarity_modifiers[rarity] for rarity in RARITIES)
+
+def rarity_codes(rarities):
+    """Encode rarity names as small integers indexing RARITIES."""
+    return array('b', [RARITY_CODES[rarity] for rarity in rarities])
+
+def attack_values(damage, rarity, ready=None):
+    """
+    Damage dealt by every weapon: damage * rarity modifier, or 0 where ready is false.
+
+    Args:
+        damage: damage of each weapon.
+        rarity: rarity code of each weapon (see rarity_codes).
+        ready: optional flags, true where the weapon is owned and equipped.
+
+    Returns:
+        A numpy array when numpy is installed, otherwise an array('d').
+    """
+    if numpy is not None:
+        values = numpy.asarray(damage, dtype=float) * numpy.asarray(WEAPON_MODIFIERS)[numpy.asarray(rarity)]
+        return values if ready is None else numpy.where(numpy.asarray(ready, dtype=bool), values, 0.0)
+    modifiers = WEAPON_MODIFIERS
+    values = array('d', [value * modifiers[code] for value, code in zip(damage, rarity)])
+    if ready is not None:
+        values = array('d', [value if flag else 0.0 for value, flag in zip(values, ready)])
+    return values
+
+def block_values(defense, rarity, broken, ready=None):
+    """Damage blocked by every shield: defense * rarity modifier, halved where broken, 0 where not ready."""
+    if numpy is not None:
+        values = numpy.asarray(defense, dtype=float) * numpy.asarray(SHIELD_MODIFIERS)[numpy.asarray(rarity)]
+        values = values * numpy.where(numpy.asarray(broken, dtype=bool), 0.5, 1.0)
+        return values if ready is None else numpy.where(numpy.asarray(ready, dtype=bool), values, 0.0)
+    modifiers = SHIELD_MODIFIERS
+    values = array('d', [value * modifiers[code] * (0.5 if is_broken else 1.0)
+                         for value, code, is_broken in zip(defense, rarity, broken)])
+    if ready is not None:
+        values = array('d', [value if flag else 0.0 for value, flag in zip(values, ready)])
+    return values
+
+class CombatTick:
+    def __init__(self, weapons, shields):
+        """
+        Resolve one tick for many weapons and shields at once.
+
+        The item attributes are gathered into columns a single time and the
+        results are plain numbers in self.attacks and self.blocks. The text of
+        Weapon.use and Shield.use is only built on request.
+        """
+        self.weapons = list(weapons)
+        self.shields = list(shields)
+        self.attacks = attack_values([weapon.damage for weapon in self.weapons],
+                                     rarity_codes(weapon.rarity for weapon in self.weapons),
+                                     [bool(weapon._ownership and weapon.active) for weapon in self.weapons])
+        self.blocks = block_values([shield.defense for shield in self.shields],
+                                   rarity_codes(shield.rarity for shield in self.shields),
+                                   [shield.broken for shield in self.shields],
+                                   [bool(shield._ownership and shield.active) for shield in self.shields])
+
+    def total_attack(self):
+        return float(sum(self.attacks))
+
+    def total_block(self):
+        return float(sum(self.blocks))
+
+    def attack_messages(self):
+        """Yield the text of weapon.use() for every weapon, in order."""
+        for weapon, value in zip(self.weapons, self.attacks):
+            if not weapon._ownership or not weapon.active:
+                yield ''
+            else:
+                yield f'{weapon.attack_move()} {weapon.name} is used, dealing {float(value)} damage'
+
+    def block_messages(self):
+        """Yield the text of shield.use() for every shield, in order."""
+        for shield, value in zip(self.shields, self.blocks):
+            if not shield._ownership or not shield.active:
+                yield ''
+            else:
+                yield f'{shield.name} is used, blocking {float(value)} damage'
+
+def make_army(count):
+    weapons = []
+    shields = []
+    for index in range(count):
+        rarity = RARITIES[index % len(RARITIES)]
+        weapon_class = SingleHandedWeapon if index % 2 else Pike
+        weapon = weapon_class(name=f'Weapon {index}', damage=10 + index % 90, type='sword', rarity=rarity)
+        shield = Shield(name=f'Shield {index}', defense=5 + index % 20, broken=index % 7 == 0, rarity=rarity)
+        weapon.pick_up(f'Soldier {index}')
+        shield.pick_up(f'Soldier {index}')
+        weapon.active = shield.active = index % 10 != 0
+        weapons.append(weapon)
+        shields.append(shield)
+    return weapons, shields
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time one combat tick with per-item use() against CombatTick.")
+    parser.add_argument("--count", type=int, default=100000, help="combatants, each with a weapon and a shield")
+    args = parser.parse_args(argv)
+
+    weapons, shields = make_army(args.count)
+    start = time.perf_counter()
+    messages = [str(weapon.use()) for weapon in weapons] + [str(shield.use()) for shield in shields]
+    per_item = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tick = CombatTick(weapons, shields)
+    batch = time.perf_counter() - start
+
+    assert list(tick.attack_messages()) + list(tick.block_messages()) == messages
+    print(f"Combatants: {args.count} ({'numpy' if numpy is not None else 'array fallback, numpy not installed'})")
+    print(f"use() per item: {per_item * 1000:.1f} ms")
+    print(f"CombatTick: {batch * 1000:.1f} ms (attack {tick.total_attack():.1f}, block {tick.total_block():.1f})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+import argparse
+import heapq
+import itertools
+import random
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from rpgserialization import Inventory, Pike, Potion, Shield, SingleHandedWeapon, Weapon
+
+TURN = 0
+BUFF_EXPIRES = 1
+EVENT_TYPES = ('attack', 'potion', 'buff_expires', 'idle')
+
+class Combatant:
+    __slots__ = ('name', 'team', 'health', 'max_health', 'attack_power', 'block_power', 'interval',
+                 'attack_buff', 'block_buff', 'timed_potions', 'healing_potions', 'alive')
+
+    def __init__(self, name, team, attack_power, block_power, health=100.0, interval=1.0,
+                 timed_potions=(), healing_potions=()):
+        self.name = name
+        self.team = team
+        self.health = self.max_health = health
+        self.attack_power = attack_power
+        self.block_power = block_power
+        self.interval = interval
+        self.attack_buff = 0.0
+        self.block_buff = 0.0
+        self.timed_potions = list(timed_potions)
+        self.healing_potions = list(healing_potions)
+        self.alive = True
+
+    @classmethod
+    def from_inventory(cls, inventory, team, health=100.0, interval=1.0,
+                       weapon_modifiers=None, shield_modifiers=None):
+        """
+        Build a combatant from the owner of inventory and its items.
+
+        The equipped weapon and shield are used (or the first ones if none is
+        equipped), with the same damage and defense formulas as Weapon.use and
+        Shield.use. Unused potions are kept for later turns. weapon_modifiers and
+        shield_modifiers replace the rarity_modifiers tables, to try other values.
+        """
+        weapon_modifiers = weapon_modifiers or Weapon.rarity_modifiers
+        shield_modifiers = shield_modifiers or Shield.rarity_modifiers
+        weapons = inventory.filter(Weapon)
+        shields = inventory.filter(Shield)
+        weapon = next((item for item in weapons if item.active), weapons[0] if weapons else None)
+        shield = next((item for item in shields if item.active), shields[0] if shields else None)
+        attack_power = weapon.damage * weapon_modifiers[weapon.rarity] if weapon else 0.0
+        block_power = 0.0
+        if shield:
+            block_power = shield.defense * shield_modifiers[shield.rarity] * (0.5 if shield.broken else 1.0)
+        potions = [potion for potion in inventory.filter(Potion) if not potion.empty]
+        return cls(inventory.owner, team, attack_power, block_power, health, interval,
+                   [potion for potion in potions if potion.effective_time > 0 and potion.potion_type in ('attack', 'defense')],
+                   [potion for potion in potions if potion.effective_time <= 0 and potion.potion_type == 'healing'])
+
+class BattleReport(NamedTuple):
+    winner: Optional[int]
+    survivors: int
+    simulated_time: float
+    events: Dict[str, int]
+    seconds: float
+    damage_dealt: float
+    damage_blocked: float
+    latency_ns: Optional[Dict[str, float]]
+    damage_by_team: Dict[int, float]
+    stalemate: bool = False
+
+    def format(self) -> str:
+        total = sum(self.events.values())
+        outcome = 'none' if self.winner is None else f'team {self.winner}'
+        if self.stalemate:
+            outcome += ', stalemate'
+        lines = [f"Winner: {outcome} "
+                 f"({self.survivors} survivors after {self.simulated_time:.1f}s of battle)",
+                 f"Damage dealt: {self.damage_dealt:.1f}, blocked: {self.damage_blocked:.1f}",
+                 f"Events: {total} in {self.seconds:.3f}s ({total / self.seconds if self.seconds else 0:,.0f} events/s)"]
+        for event_type in EVENT_TYPES:
+            count = self.events.get(event_type, 0)
+            if not count:
+                continue
+            line = f"  {event_type:<13} {count:>10}"
+            if self.latency_ns is not None:
+                line += f"  {self.latency_ns[event_type] / count:>8.0f} ns/event"
+            lines.append(line)
+        return "\n".join(lines)
+
+class Battle:
+    def __init__(self, combatants: List[Combatant], seed: Optional[int] = None, profile: bool = False):
+        """
+        A discrete-event battle: every combatant's turns and every buff expiry is an
+        event in a heap ordered by simulated time, so only the next event is ever
+        processed and idle time costs nothing. The battle also ends, with no
+        winner, in a stalemate: when no living combatant can damage any enemy.
+
+        With profile=True the wall-clock time spent handling each event type is
+        recorded, which adds a timer call per event.
+        """
+        self.combatants = combatants
+        self.rng = random.Random(seed)
+        self.random = self.rng.random
+        self.profile = profile
+        self.queue = []
+        self.sequence = itertools.count()
+        self.alive: Dict[int, List[Combatant]] = {}
+        self.position: Dict[int, int] = {}
+        self.events = dict.fromkeys(EVENT_TYPES, 0)
+        self.latency_ns = dict.fromkeys(EVENT_TYPES, 0) if profile else None
+        self.damage_dealt = 0.0
+        self.damage_blocked = 0.0
+        self.damage_by_team: Dict[int, float] = {}
+        self.now = 0.0
+        self.stalled_turns = 0
+        self.active_buffs = 0
+        self.stalemate = False
+        for combatant in combatants:
+            team = self.alive.setdefault(combatant.team, [])
+            self.position[id(combatant)] = len(team)
+            team.append(combatant)
+            self.damage_by_team[combatant.team] = 0.0
+            # Spread the first turns so that a whole army does not act at the same instant.
+            self.schedule(self.rng.uniform(0, combatant.interval), TURN, combatant, 0.0)
+
+    def schedule(self, at, kind, combatant, value):
+        heapq.heappush(self.queue, (at, next(self.sequence), kind, combatant, value))
+
+    def kill(self, combatant):
+        combatant.alive = False
+        team = self.alive[combatant.team]
+        index = self.position.pop(id(combatant))
+        last = team.pop()
+        if last is not combatant:
+            team[index] = last
+            self.position[id(last)] = index
+        if not team:
+            del self.alive[combatant.team]
+
+    def pick_target(self, combatant):
+        random = self.random
+        if len(self.alive) == 2:
+            for number, team in self.alive.items():
+                if number != combatant.team:
+                    break
+        else:
+            teams = [team for number, team in self.alive.items() if number != combatant.team]
+            if not teams:
+                return None
+            team = teams[int(random() * len(teams))]
+        return team[int(random() * len(team))]
+
+    def turn(self, combatant):
+        """Drink a potion if one helps now, otherwise attack; return the event type handled."""
+        if combatant.timed_potions and not (combatant.attack_buff or combatant.block_buff):
+            potion = combatant.timed_potions.pop()
+            potion.empty = True
+            self.active_buffs += 1
+            self.stalled_turns = 0
+            if potion.potion_type == 'attack':
+                combatant.attack_buff += potion.value
+            else:
+                combatant.block_buff += potion.value
+            self.schedule(self.now + potion.effective_time, BUFF_EXPIRES, combatant,
+                          potion.value if potion.potion_type == 'attack' else -potion.value)
+            return 'potion'
+        if combatant.healing_potions and combatant.health < combatant.max_health / 2:
+            potion = combatant.healing_potions.pop()
+            potion.empty = True
+            combatant.health = min(combatant.max_health, combatant.health + potion.value)
+            return 'potion'
+        target = self.pick_target(combatant)
+        if target is None:
+            return 'idle'
+        attack = combatant.attack_power + combatant.attack_buff
+        blocked = min(attack, target.block_power + target.block_buff)
+        damage = attack - blocked
+        if damage > 0:
+            self.stalled_turns = 0
+        else:
+            self.stalled_turns += 1
+        self.damage_dealt += damage
+        self.damage_by_team[combatant.team] += damage
+        self.damage_blocked += blocked
+        target.health -= damage
+        if target.health <= 0:
+            self.kill(target)
+        return 'attack'
+
+    def is_stalemate(self):
+        """True when no buff is running, no timed potion is left and no attacker beats any enemy's block."""
+        if self.active_buffs:
+            return False
+        strongest = {}
+        weakest = {}
+        for number, team in self.alive.items():
+            if any(combatant.timed_potions for combatant in team):
+                return False
+            strongest[number] = max(combatant.attack_power for combatant in team)
+            weakest[number] = min(combatant.block_power for combatant in team)
+        return all(strongest[attacker] <= weakest[defender]
+                   for attacker in self.alive for defender in self.alive if attacker != defender)
+
+    def run(self, until: float = float('inf'), max_events: Optional[int] = None) -> BattleReport:
+        """Process events until one team is left, simulated time passes until, or max_events were handled."""
+        queue = self.queue
+        events = self.events
+        latency = self.latency_ns
+        clock = time.perf_counter_ns
+        heappop = heapq.heappop
+        heappush = heapq.heappush
+        sequence = self.sequence
+        turn = self.turn
+        remaining = max_events if max_events is not None else -1
+        start = time.perf_counter()
+        while queue and len(self.alive) > 1 and remaining and not self.stalemate:
+            at, _, kind, combatant, value = queue[0]
+            if at > until:
+                break
+            heappop(queue)
+            if not combatant.alive:
+                continue
+            self.now = at
+            began = clock() if latency is not None else 0
+            if kind == TURN:
+                event_type = turn(combatant)
+                if combatant.alive:
+                    heappush(queue, (at + combatant.interval, next(sequence), TURN, combatant, 0.0))
+            else:
+                event_type = 'buff_expires'
+                self.active_buffs -= 1
+                if value >= 0:
+                    combatant.attack_buff -= value
+                else:
+                    combatant.block_buff += value
+            if latency is not None:
+                latency[event_type] += clock() - began
+            events[event_type] += 1
+            remaining -= 1
+            # Only look for a stalemate once every living combatant could have failed to deal damage.
+            if self.stalled_turns >= len(self.position):
+                self.stalemate = self.is_stalemate()
+                self.stalled_turns = 0
+        seconds = time.perf_counter() - start
+
+        winner = next(iter(self.alive)) if len(self.alive) == 1 else None
+        return BattleReport(winner, sum(len(team) for team in self.alive.values()), self.now,
+                            {name: count for name, count in events.items() if count}, seconds,
+                            self.damage_dealt, self.damage_blocked, latency, dict(self.damage_by_team),
+                            self.stalemate)
+
+def make_inventory(rng, owner, rarity=None):
+    inventory = Inventory(owner=owner)
+    rarity = rarity or rng.choice(('common', 'uncommon', 'epic', 'legendary'))
+    weapon_class = rng.choice((SingleHandedWeapon, Pike))
+    weapon = weapon_class(name=f'{owner} weapon', damage=rng.randint(5, 25), type='sword', rarity=rarity)
+    shield = Shield(name=f'{owner} shield', defense=rng.randint(0, 6), broken=rng.random() < 0.2, rarity=rarity)
+    inventory.add_item(weapon)
+    inventory.add_item(shield)
+    weapon.active = shield.active = True
+    inventory.add_item(Potion(name='Atk Potion', potion_type='attack', value=5, effective_time=10))
+    inventory.add_item(Potion(name='Healing Potion', potion_type='healing', value=50))
+    return inventory
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a headless battle between teams of generated characters.")
+    parser.add_argument("--teams", type=int, default=2, help="number of teams")
+    parser.add_argument("--size", type=int, default=5000, help="characters per team")
+    parser.add_argument("--health", type=float, default=300.0, help="starting health of every character")
+    parser.add_argument("--until", type=float, default=float('inf'), help="stop after this much simulated time")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for armies and targeting")
+    parser.add_argument("--profile", action="store_true", help="measure the latency of every event type")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    combatants = [Combatant.from_inventory(make_inventory(rng, f'Team {team} #{index}'), team, args.health,
+                                           interval=rng.uniform(0.8, 1.2))
+                  for team in range(args.teams) for index in range(args.size)]
+    battle = Battle(combatants, seed=args.seed, profile=args.profile)
+    print(battle.run(until=args.until).format())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
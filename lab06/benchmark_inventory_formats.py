@@ -0,0 +1,60 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import inventory_codec
+import rpgserialization as rpg
+
+def make_inventory(count):
+    inventory = rpg.Inventory(owner='Beleg')
+    for index in range(count):
+        rarity = ('common', 'uncommon', 'epic', 'legendary')[index % 4]
+        if index % 3 == 0:
+            item = rpg.SingleHandedWeapon(name=f'Sword {index}', damage=10 + index % 300, type='sword', rarity=rarity)
+        elif index % 3 == 1:
+            item = rpg.Shield(name=f'Shield {index}', description='A sturdy wooden shield', defense=index % 50,
+                              broken=index % 5 == 0, rarity=rarity)
+        else:
+            item = rpg.Potion(name=f'Potion {index}', potion_type='healing', value=50, effective_time=index % 30,
+                              rarity=rarity)
+        inventory.add_item(item)
+    return inventory
+
+def best_of(repeat, action):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = action()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare JSON, JSON Lines and binary inventory saves.")
+    parser.add_argument("--count", type=int, default=100000, help="items in the inventory")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the fastest is kept")
+    args = parser.parse_args(argv)
+
+    inventory = make_inventory(args.count)
+    expected = inventory.to_json()
+    formats = [
+        ('json', 'inventory.json', inventory.save_to_file, rpg.Inventory.load_from_file),
+        ('jsonl', 'inventory.jsonl', inventory.save_to_file, rpg.Inventory.load_from_file),
+        ('binary', 'inventory.inv', lambda filename: inventory_codec.save(inventory, filename), inventory_codec.load),
+    ]
+    print(f"Items: {args.count}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, filename, save, load in formats:
+            path = os.path.join(directory, filename)
+            save_seconds, _ = best_of(args.repeat, lambda: save(path))
+            load_seconds, loaded = best_of(args.repeat, lambda: load(path))
+            if loaded.to_json() != expected:
+                print(f"{name}: loaded inventory differs from the saved one")
+                return 1
+            print(f"{name:<7} {os.path.getsize(path) / 1024:>9.0f} KiB   save {save_seconds * 1000:>8.1f} ms   "
+                  f"load {load_seconds * 1000:>8.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
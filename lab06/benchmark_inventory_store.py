@@ -0,0 +1,85 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import rpgserialization as rpg
+from inventory_store import InventoryStore
+
+RARITIES = ('common', 'uncommon', 'epic', 'legendary')
+
+def make_inventories(players, items, seed=0):
+    rng = random.Random(seed)
+    inventories = []
+    for player in range(players):
+        inventory = rpg.Inventory(owner=f'Player {player}')
+        for index in range(items):
+            rarity = rng.choice(RARITIES)
+            kind = rng.randrange(3)
+            if kind == 0:
+                item = rng.choice((rpg.SingleHandedWeapon, rpg.Pike, rpg.RangedWeapon))(
+                    name=f'Weapon {index}', damage=rng.randint(5, 300), type='sword', rarity=rarity)
+            elif kind == 1:
+                item = rpg.Shield(name=f'Shield {index}', defense=rng.randint(1, 50), rarity=rarity)
+            else:
+                item = rpg.Potion(name=f'Potion {index}', potion_type='healing', value=50, rarity=rarity)
+            inventory.add_item(item)
+        inventories.append(inventory)
+    return inventories
+
+def timed(action):
+    start = time.perf_counter()
+    result = action()
+    return time.perf_counter() - start, result
+
+def json_path(directory, owner):
+    return os.path.join(directory, f'{owner}.json')
+
+def json_query(directory, owners, item_type, rarity):
+    matches = []
+    for owner in owners:
+        inventory = rpg.Inventory.load_from_file(json_path(directory, owner))
+        matches.extend((owner, item) for item in inventory.filter(item_type, rarity))
+    return matches
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare one JSON file per player with a shared SQLite store.")
+    parser.add_argument("--players", type=int, default=10000, help="number of inventories")
+    parser.add_argument("--items", type=int, default=20, help="items per inventory")
+    args = parser.parse_args(argv)
+
+    inventories = make_inventories(args.players, args.items)
+    owners = [inventory.owner for inventory in inventories]
+    sample = owners[len(owners) // 2]
+    with tempfile.TemporaryDirectory() as directory:
+        def save_json():
+            for inventory in inventories:
+                inventory.save_to_file(json_path(directory, inventory.owner))
+
+        store = InventoryStore(os.path.join(directory, 'inventories.sqlite'))
+        rows = [
+            ('save all', timed(save_json)[0], timed(lambda: store.save_many(inventories))[0]),
+        ]
+        json_seconds, json_matches = timed(lambda: json_query(directory, owners, rpg.Weapon, 'legendary'))
+        store_seconds, store_matches = timed(lambda: store.query(rpg.Weapon, 'legendary'))
+        if sorted((owner, str(item.to_json())) for owner, item in json_matches) != \
+                sorted((owner, str(item.to_json())) for owner, item in store_matches):
+            print("The two backends returned different legendary weapons")
+            return 1
+        rows.append((f'legendary weapons ({len(store_matches)})', json_seconds, store_seconds))
+        rows.append(('count legendary weapons', json_seconds, timed(lambda: store.count(rpg.Weapon, 'legendary'))[0]))
+        rows.append(('load one player',
+                     timed(lambda: rpg.Inventory.load_from_file(json_path(directory, sample)))[0],
+                     timed(lambda: store.load(sample))[0]))
+        store.close()
+
+    print(f"Players: {args.players}, items per player: {args.items}")
+    print(f"{'operation':<32} {'JSON files':>12} {'SQLite':>12}")
+    for name, json_time, store_time in rows:
+        print(f"{name:<32} {json_time * 1000:>9.1f} ms {store_time * 1000:>9.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import argparse
+import json
+import sys
+import tracemalloc
+
+import rpgserialization as rpg
+
+def make_records(count):
+    """Encoded item records; decoding them gives every item its own rarity and type strings, as a load does."""
+    templates = [
+        rpg.SingleHandedWeapon(name='Sword', damage=30, type='sword', rarity='common'),
+        rpg.Pike(name='Spear', damage=29, type='spear', rarity='uncommon'),
+        rpg.RangedWeapon(name='Bow', damage=50, type='bow', rarity='legendary'),
+        rpg.Shield(name='Round Shield', description='A sturdy wooden shield', defense=10, rarity='epic'),
+        rpg.Potion(name='Healing Potion', potion_type='healing', value=50, rarity='uncommon'),
+    ]
+    records = [templates[index % len(templates)].to_json() for index in range(count)]
+    for index, record in enumerate(records):
+        record['name'] = f"{record['name']} {index}"
+    return json.dumps(records)
+
+def build_slotted(records):
+    return [getattr(rpg, record['class']).from_json(record) for record in records]
+
+def build_dict_backed(records):
+    """Plain objects holding the same attributes in a __dict__, as the item classes did before __slots__."""
+    classes = {}
+    items = []
+    for record in records:
+        cls = classes.setdefault(record['class'], type(record['class'], (), {}))
+        item = cls()
+        for key, value in record.items():
+            if key != 'class':
+                setattr(item, key, value)
+        item._ownership = None
+        items.append(item)
+    return items
+
+def bytes_per_item(build, encoded):
+    """Memory still held once the items are built and the decoded records are freed."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    items = build(json.loads(encoded))
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / len(items)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the memory used per item with and without __slots__.")
+    parser.add_argument("--count", type=int, default=200000, help="items to create")
+    args = parser.parse_args(argv)
+
+    records = make_records(args.count)
+    dict_backed = bytes_per_item(build_dict_backed, records)
+    slotted = bytes_per_item(build_slotted, records)
+    print(f"Items: {args.count}")
+    print(f"__dict__ items: {dict_backed:.0f} bytes per item")
+    print(f"__slots__ items: {slotted:.0f} bytes per item")
+    print(f"Saved: {dict_backed - slotted:.0f} bytes per item ({(1 - slotted / dict_backed) * 100:.0f}%)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import inventory_codec
+import rpgserialization as rpg
+
+RARITIES = ('common', 'uncommon', 'epic', 'legendary')
+NAMES = ('Sword', 'Shield', 'Potion', 'Muramasa', 'Pot Lid', 'Épée', '弓', '')
+
+def random_text(rng):
+    return f'{rng.choice(NAMES)} {rng.randrange(1000)}' if rng.random() < 0.9 else rng.choice(NAMES)
+
+def random_number(rng):
+    return rng.randrange(-5, 1000) if rng.random() < 0.7 else round(rng.uniform(0, 500), rng.randrange(4))
+
+def random_item(rng, owner):
+    """An item of any registered class with every piece of state chosen at random."""
+    cls = rng.choice(list(rpg.ITEM_CLASSES.values()))
+    rarity = rng.choice(RARITIES)
+    if issubclass(cls, rpg.Weapon):
+        item = cls(name=random_text(rng), damage=random_number(rng), type=rng.choice(('sword', 'bow', 'spear')),
+                   description=random_text(rng), rarity=rarity)
+        item.active = rng.random() < 0.5
+    elif issubclass(cls, rpg.Shield):
+        item = cls(name=random_text(rng), description=random_text(rng), defense=random_number(rng),
+                   broken=rng.random() < 0.5, rarity=rarity)
+        item.active = rng.random() < 0.5
+    elif issubclass(cls, rpg.Potion):
+        item = cls(name=random_text(rng), potion_type=rng.choice(('healing', 'attack')), value=random_number(rng),
+                   effective_time=random_number(rng), rarity=rarity)
+        item.description = random_text(rng)
+        item.empty = rng.random() < 0.5
+    else:
+        item = cls(name=random_text(rng), description=random_text(rng), rarity=rarity)
+    item._ownership = rng.choice((owner, owner, None, 'Someone else'))
+    return item
+
+def random_inventory(rng, size):
+    inventory = rpg.Inventory(owner=rng.choice(('Beleg', 'Túrin', None)))
+    for _ in range(size):
+        inventory._insert(random_item(rng, inventory.owner))
+    return inventory
+
+def item_state(item):
+    """The class and every slot of item, which is its complete state."""
+    slots = [name for cls in type(item).__mro__ for name in getattr(cls, '__slots__', ()) if name != '_tracker']
+    return (type(item).__name__,) + tuple((name, type(getattr(item, name)), getattr(item, name)) for name in slots)
+
+def inventory_state(inventory):
+    return inventory.owner, [item_state(item) for item in inventory]
+
+def save_jsonl(inventory, filename):
+    inventory.save_to_jsonl(filename)
+
+FORMATS = [
+    ('json', 'inventory.json', rpg.Inventory.save_to_file, rpg.Inventory.load_from_file),
+    ('jsonl', 'inventory.jsonl', save_jsonl, rpg.Inventory.load_from_jsonl),
+    ('binary', 'inventory.inv', inventory_codec.save, inventory_codec.load),
+]
+
+def check(inventory, directory):
+    """Return the formats that do not give back exactly the state that was saved."""
+    expected = inventory_state(inventory)
+    failures = []
+    for name, filename, save, load in FORMATS:
+        path = os.path.join(directory, filename)
+        save(inventory, path)
+        if inventory_state(load(path)) != expected:
+            failures.append(name)
+    return failures
+
+def change_at_random(rng, inventory):
+    """Make one random change through the public item and inventory methods, which snapshots track."""
+    items = inventory.items
+    action = rng.randrange(5) if items else 0
+    if action == 0:
+        inventory.add_item(random_item(rng, inventory.owner))
+    elif action == 1:
+        inventory.remove_item(rng.choice(items))
+    elif action == 2:
+        item = rng.choice(items)
+        if hasattr(item, 'equip'):
+            item.equip()
+        elif isinstance(item, rpg.Potion):
+            item.use()
+    elif action == 3:
+        rng.choice(items).pick_up(random_text(rng))
+    else:
+        item = rng.choice(items)
+        item.name = random_text(rng)
+        inventory.touch(item)
+
+def check_snapshots(rng, directory, rounds, changes):
+    """Return a description of the first snapshot that restore or load_snapshot does not give back exactly."""
+    inventory = random_inventory(rng, rng.randrange(30))
+    expected = []
+    paths = []
+    first = 0
+    for number in range(rounds):
+        for _ in range(rng.randrange(changes)):
+            change_at_random(rng, inventory)
+        paths.append(os.path.join(directory, f'snapshot-{number}.jsonl'))
+        inventory.snapshot(paths[-1])
+        expected.append(inventory_state(inventory))
+        if rng.random() < 0.2:
+            inventory.restore(rng.randrange(first, number + 1))
+        if rng.random() < 0.1:
+            first = rng.randrange(first, number + 1)
+            inventory.drop_snapshots(first, paths[first])
+    for number in rng.sample(range(first, rounds), rounds - first):
+        if inventory_state(rpg.Inventory.load_snapshot(paths[first:number + 1])) != expected[number]:
+            return f'load_snapshot of snapshot {number}'
+        inventory.restore(number)
+        if inventory_state(inventory) != expected[number]:
+            return f'restore of snapshot {number}'
+    return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Round-trip random inventories through every save format.")
+    parser.add_argument("--seed", type=int, default=None, help="random seed (default: a fresh one, printed)")
+    parser.add_argument("--trials", type=int, default=300, help="small random inventories to check")
+    parser.add_argument("--count", type=int, default=100000, help="items in the large inventory")
+    args = parser.parse_args(argv)
+
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    print(f"Seed: {seed}")
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        for trial in range(args.trials):
+            inventory = random_inventory(rng, rng.randrange(30))
+            failures = check(inventory, directory)
+            if failures:
+                print(f"Trial {trial}: {', '.join(failures)} lost state of {inventory_state(inventory)}")
+                return 1
+        print(f"Small inventories: {args.trials} passed")
+
+        rpg.set_message_sink(None)
+        for trial in range(args.trials):
+            failure = check_snapshots(rng, directory, rounds=8, changes=6)
+            if failure:
+                print(f"Trial {trial}: {failure} lost state")
+                return 1
+        print(f"Snapshot histories: {args.trials} passed")
+
+        inventory = random_inventory(rng, args.count)
+        expected = inventory_state(inventory)
+        for name, filename, save, load in FORMATS:
+            path = os.path.join(directory, filename)
+            save(inventory, path)
+            start = time.perf_counter()
+            loaded = load(path)
+            elapsed = time.perf_counter() - start
+            if inventory_state(loaded) != expected:
+                print(f"{name}: {args.count} items did not round-trip")
+                return 1
+            print(f"{name:<7} {args.count} items round-trip, load {elapsed * 1000:.0f} ms "
+                  f"({args.count / elapsed:,.0f} items/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
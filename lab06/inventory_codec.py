@@ -0,0 +1,185 @@
+import mmap
+import os
+import struct
+
+import rpgserialization as rpg
+
+# File layout (all little-endian):
+#   header   magic, version, class count, string count, record count, owner string
+#   classes  one string index per class name; a record's tag indexes this table
+#   strings  string count + 1 offsets into the UTF-8 blob that follows them
+#   records  fixed-width RECORD structs
+#   blob     the UTF-8 bytes of every distinct string, each stored once
+MAGIC = b'RPGI'
+VERSION = 2
+HEADER = struct.Struct('<4sHHIII')
+OFFSET = struct.Struct('<I')
+RECORD = struct.Struct('<BBIIIIIdd')
+RECORD_V1 = struct.Struct('<BBIIIIdd')  # version 1 had no ownership slot
+NO_STRING = 0xFFFFFFFF
+
+ACTIVE = 1
+BROKEN = 2
+EMPTY = 4
+FIRST_IS_INT = 8
+SECOND_IS_INT = 16
+
+class StringTable:
+    def __init__(self):
+        self.indexes = {}
+        self.strings = []
+
+    def add(self, value):
+        if value is None:
+            return NO_STRING
+        index = self.indexes.get(value)
+        if index is None:
+            index = self.indexes[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+def number_flags(first, second):
+    return (FIRST_IS_INT if isinstance(first, int) else 0) | (SECOND_IS_INT if isinstance(second, int) else 0)
+
+def slot_names(cls):
+    return {name for klass in cls.__mro__ for name in getattr(klass, '__slots__', ())}
+
+def check_storable(cls):
+    """
+    Refuse item classes whose state a RECORD cannot hold.
+
+    Records store the fields of Item, Weapon, Shield and Potion and rebuild items
+    through those constructors, so a registered subclass (from any module) with
+    extra slots, an instance __dict__ or its own __init__ would silently lose state.
+    """
+    base = next(base for base in (rpg.Weapon, rpg.Shield, rpg.Potion, rpg.Item) if issubclass(cls, base))
+    if cls.__dictoffset__ or slot_names(cls) != slot_names(base) or cls.__init__ is not base.__init__:
+        raise ValueError(f'The binary inventory format cannot store {cls.__name__}: it has state or a constructor '
+                         f'beyond {base.__name__}; save it as JSON instead')
+
+def encode_item(item, strings, tags):
+    """Pack one item into a RECORD; the meaning of the string and number slots depends on the class."""
+    cls = type(item)
+    tag = tags.get(cls.__name__)
+    if tag is None:
+        check_storable(cls)
+        tag = tags[cls.__name__] = len(tags)
+    extra = NO_STRING
+    first = second = 0
+    flags = 0
+    if isinstance(item, rpg.Weapon):
+        extra = strings.add(item.type)
+        first = item.damage
+        flags = ACTIVE if item.active else 0
+    elif isinstance(item, rpg.Shield):
+        first = item.defense
+        flags = (ACTIVE if item.active else 0) | (BROKEN if item.broken else 0)
+    elif isinstance(item, rpg.Potion):
+        extra = strings.add(item.potion_type)
+        first, second = item.value, item.effective_time
+        flags = EMPTY if item.empty else 0
+    flags |= number_flags(first, second)
+    return RECORD.pack(tag, flags, strings.add(item.rarity), strings.add(item.name),
+                       strings.add(item.description), extra, strings.add(item._ownership), first, second)
+
+def decode_item(cls, flags, rarity, name, description, extra, ownership, first, second):
+    if flags & FIRST_IS_INT:
+        first = int(first)
+    if flags & SECOND_IS_INT:
+        second = int(second)
+    if issubclass(cls, rpg.Weapon):
+        item = cls(name=name, damage=first, type=extra, description=description, rarity=rarity)
+        item.active = bool(flags & ACTIVE)
+    elif issubclass(cls, rpg.Shield):
+        item = cls(name=name, description=description, defense=first, broken=bool(flags & BROKEN), rarity=rarity)
+        item.active = bool(flags & ACTIVE)
+    elif issubclass(cls, rpg.Potion):
+        item = cls(name=name, potion_type=extra, value=first, effective_time=second, rarity=rarity)
+        item.description = description
+        item.empty = bool(flags & EMPTY)
+    else:
+        item = cls(name=name, description=description, rarity=rarity)
+    item._ownership = ownership
+    return item
+
+def dumps(inventory):
+    """Encode an inventory and all its items in the binary format."""
+    strings = StringTable()
+    tags = {}
+    owner = strings.add(inventory.owner)
+    records = [encode_item(item, strings, tags) for item in inventory]
+    class_names = [strings.add(name) for name in tags]
+
+    encoded = [value.encode('utf-8') for value in strings.strings]
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+
+    return b''.join([
+        HEADER.pack(MAGIC, VERSION, len(class_names), len(encoded), len(records), owner),
+        struct.pack(f'<{len(class_names)}I', *class_names),
+        struct.pack(f'<{len(offsets)}I', *offsets),
+        *records,
+        *encoded,
+    ])
+
+def loads(data, inventory_class=rpg.Inventory):
+    """
+    Decode an inventory from bytes, a bytearray, an mmap or a memoryview.
+
+    The buffer is read through a memoryview: records are unpacked in place and
+    each distinct string is decoded once, straight from its slice of the blob.
+    """
+    with memoryview(data) as view:
+        if len(view) < HEADER.size:
+            raise ValueError('Not an inventory file: too short')
+        magic, version, class_count, string_count, record_count, owner = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError('Not an inventory file: bad magic')
+        if version > VERSION:
+            raise ValueError(f'Unsupported inventory file version {version}')
+
+        position = HEADER.size
+        class_names = struct.unpack_from(f'<{class_count}I', view, position)
+        position += OFFSET.size * class_count
+        offsets = struct.unpack_from(f'<{string_count + 1}I', view, position)
+        position += OFFSET.size * (string_count + 1)
+        record = RECORD if version >= 2 else RECORD_V1
+        records_end = position + record.size * record_count
+        blob = records_end
+        if blob + offsets[-1] > len(view):
+            raise ValueError('Not an inventory file: truncated')
+
+        strings = [str(view[blob + offsets[index]:blob + offsets[index + 1]], 'utf-8')
+                   for index in range(string_count)]
+        string_at = strings.__getitem__
+
+        def text(index):
+            return None if index == NO_STRING else string_at(index)
+
+        classes = [rpg.item_class_for(strings[index]) for index in class_names]
+        for cls in classes:
+            check_storable(cls)
+        inventory = inventory_class(text(owner))
+        with view[position:records_end] as records:
+            if version >= 2:
+                for tag, flags, rarity, name, description, extra, ownership, first, second in record.iter_unpack(records):
+                    inventory._insert(decode_item(classes[tag], flags, text(rarity), text(name),
+                                                  text(description), text(extra), text(ownership), first, second))
+            else:
+                for tag, flags, rarity, name, description, extra, first, second in record.iter_unpack(records):
+                    inventory._insert(decode_item(classes[tag], flags, text(rarity), text(name),
+                                                  text(description), text(extra), inventory.owner, first, second))
+    return inventory
+
+def save(inventory, filename):
+    with open(filename, 'wb') as f:
+        f.write(dumps(inventory))
+
+def load(filename, inventory_class=rpg.Inventory):
+    """Load an inventory file by memory-mapping it, so records are decoded straight from the page cache."""
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return loads(b'', inventory_class)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return loads(mapped, inventory_class)
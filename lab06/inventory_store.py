@@ -0,0 +1,116 @@
+import json
+import sqlite3
+
+import rpgserialization as rpg
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS inventories (
+    owner TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS items (
+    owner TEXT,
+    position INTEGER NOT NULL,
+    class TEXT NOT NULL,
+    rarity TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+-- A primary key allows any number of NULLs: keep a single row for the unowned inventory.
+DELETE FROM inventories WHERE owner IS NULL
+    AND rowid NOT IN (SELECT min(rowid) FROM inventories WHERE owner IS NULL);
+CREATE UNIQUE INDEX IF NOT EXISTS inventories_unowned ON inventories (owner IS NULL) WHERE owner IS NULL;
+CREATE INDEX IF NOT EXISTS items_owner ON items (owner, position);
+CREATE INDEX IF NOT EXISTS items_class ON items (class, rarity);
+CREATE INDEX IF NOT EXISTS items_rarity ON items (rarity);
+"""
+
+def class_names(item_type):
+    """Names of the registered item classes that are item_type or inherit from it."""
+    return [name for name, cls in rpg.ITEM_CLASSES.items() if issubclass(cls, item_type)]
+
+class InventoryStore:
+    def __init__(self, path=':memory:'):
+        """
+        Many inventories in one SQLite database.
+
+        Every item is a row holding its owner, class and rarity (each indexed)
+        plus its complete to_json() state, so filters across all players are
+        indexed queries and only matching items are ever decoded.
+        """
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, inventory):
+        self.connection.execute('DELETE FROM items WHERE owner IS ?', (inventory.owner,))
+        self.connection.execute('INSERT OR IGNORE INTO inventories VALUES (?)', (inventory.owner,))
+        encoder = rpg.CustomEncoder()
+        self.connection.executemany(
+            'INSERT INTO items VALUES (?, ?, ?, ?, ?)',
+            [(inventory.owner, position, type(item).__name__, item.rarity, encoder.encode(item.to_json()))
+             for position, item in enumerate(inventory)])
+
+    def save(self, inventory):
+        """Store inventory, replacing whatever was stored for its owner."""
+        with self.connection:
+            self._write(inventory)
+
+    def save_many(self, inventories):
+        """Store many inventories in a single transaction."""
+        with self.connection:
+            for inventory in inventories:
+                self._write(inventory)
+
+    def delete(self, owner):
+        with self.connection:
+            self.connection.execute('DELETE FROM items WHERE owner IS ?', (owner,))
+            self.connection.execute('DELETE FROM inventories WHERE owner IS ?', (owner,))
+
+    def owners(self):
+        return [owner for owner, in self.connection.execute('SELECT owner FROM inventories ORDER BY owner')]
+
+    def _select(self, columns, owner=None, item_type=None, rarity=None, any_owner=False, order=True):
+        conditions = []
+        parameters = []
+        if not any_owner:
+            conditions.append('owner IS ?')
+            parameters.append(owner)
+        if item_type is not None:
+            names = class_names(item_type)
+            conditions.append(f"class IN ({', '.join('?' * len(names))})")
+            parameters.extend(names)
+        if rarity is not None:
+            conditions.append('rarity = ?')
+            parameters.append(rarity)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+        order_by = ' ORDER BY owner, position' if order else ''
+        return self.connection.execute(f'SELECT {columns} FROM items{where}{order_by}', parameters)
+
+    def load(self, owner, item_type=None, rarity=None):
+        """
+        Load the inventory of owner, or None if it was never stored.
+
+        item_type and rarity restrict it to matching items, like Inventory.filter.
+        """
+        if self.connection.execute('SELECT 1 FROM inventories WHERE owner IS ?', (owner,)).fetchone() is None:
+            return None
+        inventory = rpg.Inventory(owner)
+        for data, in self._select('data', owner, item_type, rarity):
+            inventory._insert(rpg.restore_item(json.loads(data), owner))
+        return inventory
+
+    def query(self, item_type=None, rarity=None):
+        """Return (owner, item) for every matching item across all stored inventories."""
+        return [(owner, rpg.restore_item(json.loads(data), owner))
+                for owner, data in self._select('owner, data', item_type=item_type, rarity=rarity, any_owner=True)]
+
+    def count(self, item_type=None, rarity=None):
+        """Count matching items across all stored inventories without decoding them."""
+        return self._select('COUNT(*)', item_type=item_type, rarity=rarity, any_owner=True, order=False).fetchone()[0]
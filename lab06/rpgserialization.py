@@ -1,24 +1,114 @@
+import heapq
 import json
+import sys
 
+class ItemEvent:
+    """
+    What an item action did: its type, who acted, the item and a numeric value.
+
+    Building one costs no string formatting; the message is only rendered when
+    str() is called, e.g. by print. It is rendered from the item as it is then.
+    """
+    __slots__ = ('type', 'actor', 'item', 'value')
+
+    def __init__(self, type, actor, item, value=None):
+        self.type = type
+        self.actor = actor
+        self.item = item
+        self.value = value
+
+    def __str__(self):
+        return EVENT_MESSAGES[self.type](self)
+
+    def __repr__(self):
+        return f'ItemEvent({self.type!r}, {self.actor!r}, {self.item.name!r}, {self.value!r})'
+
+def potion_message(event):
+    potion = event.item
+    consumed = f'{potion.potion_type.capitalize()} potion has been consumed'
+    if event.type == 'boost':
+        return f'{event.actor} used {potion.name}, and {potion.potion_type} increased by {event.value} for {potion.effective_time}s\n{consumed}'
+    return f'{event.actor} consumed {potion.name}\n{consumed}'
+
+EVENT_MESSAGES = {
+    'pick_up': lambda event: f'{event.item.name} is now owned by {event.actor}',
+    'throw_away': lambda event: f'{event.item.name} has been thrown away',
+    'use': lambda event: f'{event.item.name} is used',
+    'attack': lambda event: f'{event.item.attack_move(event.actor)} {event.item.name} is used, dealing {event.value} damage',
+    'block': lambda event: f'{event.item.name} is used, blocking {event.value} damage',
+    'boost': potion_message,
+    'consume': potion_message,
+    'equip': lambda event: f'{event.item.name} is equipped.',
+    'drop': lambda event: f'{event.item.name} has been dropped by {event.actor}.',
+    'not_in_inventory': lambda event: f'{event.item.name} is not in the inventory.',
+}
+
+message_sink = print
+
+def set_message_sink(sink):
+    """
+    Route the events that equip and drop_item used to print.
+
+    sink is called with each ItemEvent; pass None to discard them. A logger works
+    without formatting unless the record is emitted:
+    set_message_sink(lambda event: logger.info('%s', event)).
+    """
+    global message_sink
+    message_sink = sink
+
+def emit(event):
+    if message_sink is not None:
+        message_sink(event)
+
+ITEM_CLASSES = {}
+ITEM_DECODERS = {}
+
+def register_item(cls):
+    """
+    Class decorator that lets saved inventories name cls in their 'class' field.
+
+    Classes from any module can register; loading only builds registered classes.
+    """
+    registered = ITEM_CLASSES.get(cls.__name__)
+    if registered is not None and registered is not cls:
+        raise ValueError(f'An item class named {cls.__name__} is already registered')
+    ITEM_CLASSES[cls.__name__] = cls
+    ITEM_DECODERS[cls.__name__] = cls.from_json
+    return cls
+
+@register_item
 class Item:
+    # Items are created by the million in world simulations, so the whole hierarchy
+    # uses __slots__ instead of a per-instance __dict__.
+    # _tracker is the changed-item set of the snapshotting Inventory holding the item, if any.
+    __slots__ = ('name', 'description', 'rarity', '_ownership', '_tracker')
+
     def __init__(self, name, description='', rarity='common'):
         self.name = name
         self.description = description
-        self.rarity = rarity
+        self.rarity = sys.intern(rarity)
         self._ownership = None
+        self._tracker = None
+
+    def changed(self):
+        """Tell a snapshotting inventory that this item's state changed."""
+        if self._tracker is not None:
+            self._tracker.add(self)
 
     def pick_up(self, character: str):
         self._ownership = character
-        return f'{self.name} is now owned by {character}'
+        self.changed()
+        return ItemEvent('pick_up', character, self)
 
     def throw_away(self):
         self._ownership = None
-        return f'{self.name} has been thrown away'
+        self.changed()
+        return ItemEvent('throw_away', None, self)
 
     def use(self):
         if not self._ownership:
             return ''
-        return f'{self.name} is used'
+        return ItemEvent('use', self._ownership, self)
 
     def __str__(self):
         if self.rarity == 'legendary':
@@ -33,6 +123,7 @@ class Item:
     def to_json(self):
         """Convert item to a JSON-encodable dictionary."""
         return {
+            'class': self.__class__.__name__,
             'name': self.name,
             'description': self.description,
             'rarity': self.rarity,
@@ -42,9 +133,14 @@ class Item:
     @classmethod
     def from_json(cls, data):
         """Create an item instance from JSON data."""
-        return cls(name=data['name'], description=data['description'], rarity=data['rarity'])
+        item = cls(name=data['name'], description=data['description'], rarity=data['rarity'])
+        item._ownership = data.get('ownership')
+        return item
 
+@register_item
 class Weapon(Item):
+    __slots__ = ('damage', 'type', 'active')
+
     rarity_modifiers = {
         'common': 1.0,
         'uncommon': 1.0,
@@ -55,21 +151,23 @@ class Weapon(Item):
     def __init__(self, name, damage, type, description='', rarity='common'):
         super().__init__(name, description, rarity)
         self.damage = damage
-        self.type = type
+        self.type = sys.intern(type)
         self.active = False
 
     def equip(self):
         self.active = True
-        print(f'{self.name} is equipped.')
+        self.changed()
+        emit(ItemEvent('equip', self._ownership, self))
 
-    def attack_move(self):
+    def attack_move(self, actor=None):
+        """The attack text for actor, or for the current owner if actor is not given."""
         return ''
 
     def use(self):
         if not self._ownership or not self.active:
             return ''
         attack_power = self.damage * Weapon.rarity_modifiers[self.rarity]
-        return f'{self.attack_move()} {self.name} is used, dealing {attack_power} damage'
+        return ItemEvent('attack', self._ownership, self, attack_power)
 
     def to_json(self):
         """Convert Weapon instance to JSON-encodable dictionary."""
@@ -80,7 +178,8 @@ class Weapon(Item):
             'rarity': self.rarity,
             'damage': self.damage,
             'type': self.type,
-            'active': self.active
+            'active': self.active,
+            'ownership': self._ownership
         }
 
     @classmethod
@@ -94,31 +193,49 @@ class Weapon(Item):
         Returns:
             Weapon: A new Weapon or subclass instance.
         """
-        return cls(
+        weapon = cls(
             name=data['name'],
             damage=data['damage'],
             type=data['type'],
             description=data.get('description', ''),
             rarity=data.get('rarity', 'common')
         )
+        weapon.active = data.get('active', False)
+        weapon._ownership = data.get('ownership')
+        return weapon
 
+@register_item
 class SingleHandedWeapon(Weapon):
-    def attack_move(self):
-        return f'{self._ownership} slashes with {self.name}'
+    __slots__ = ()
 
+    def attack_move(self, actor=None):
+        return f'{actor or self._ownership} slashes with {self.name}'
+
+@register_item
 class DoubleHandedWeapon(Weapon):
-    def attack_move(self):
-        return f'{self._ownership} spins {self.name} powerfully'
+    __slots__ = ()
+
+    def attack_move(self, actor=None):
+        return f'{actor or self._ownership} spins {self.name} powerfully'
 
+@register_item
 class Pike(Weapon):
-    def attack_move(self):
-        return f'{self._ownership} thrusts forward with {self.name}'
+    __slots__ = ()
 
+    def attack_move(self, actor=None):
+        return f'{actor or self._ownership} thrusts forward with {self.name}'
+
+@register_item
 class RangedWeapon(Weapon):
-    def attack_move(self):
-        return f'{self._ownership} shoots an arrow from {self.name}'
+    __slots__ = ()
+
+    def attack_move(self, actor=None):
+        return f'{actor or self._ownership} shoots an arrow from {self.name}'
 
+@register_item
 class Shield(Item):
+    __slots__ = ('defense', 'broken', 'active')
+
     rarity_modifiers = {
         'common': 1.0,
         'uncommon': 1.0,
@@ -134,14 +251,15 @@ class Shield(Item):
 
     def equip(self):
         self.active = True
-        print(f'{self.name} is equipped.')
+        self.changed()
+        emit(ItemEvent('equip', self._ownership, self))
 
     def use(self):
         if not self._ownership or not self.active:
             return ''
         defense_modifier = 0.5 if self.broken else 1.0
         defense_power = self.defense * Shield.rarity_modifiers[self.rarity] * defense_modifier
-        return f'{self.name} is used, blocking {defense_power} damage'
+        return ItemEvent('block', self._ownership, self, defense_power)
 
     def to_json(self):
         """Convert Shield instance to JSON-encodable dictionary."""
@@ -152,7 +270,8 @@ class Shield(Item):
             'rarity': self.rarity,
             'defense': self.defense,
             'broken': self.broken,
-            'active': self.active
+            'active': self.active,
+            'ownership': self._ownership
         }
 
     @classmethod
@@ -174,13 +293,17 @@ class Shield(Item):
             rarity=data.get('rarity', 'common')
         )
         shield.active = data.get('active', False)
+        shield._ownership = data.get('ownership')
         return shield
 
 
+@register_item
 class Potion(Item):
+    __slots__ = ('potion_type', 'value', 'effective_time', 'empty')
+
     def __init__(self, name, potion_type, value, effective_time=0, rarity='common'):
         super().__init__(name, rarity=rarity)
-        self.potion_type = potion_type
+        self.potion_type = sys.intern(potion_type)
         self.value = value
         self.effective_time = effective_time
         self.empty = False
@@ -198,21 +321,24 @@ class Potion(Item):
         if self.empty:
             return ''
         self.empty = True
+        self.changed()
         if self.effective_time > 0:
-            return f'{self._ownership} used {self.name}, and {self.potion_type} increased by {self.value} for {self.effective_time}s\n{self.potion_type.capitalize()} potion has been consumed'
+            return ItemEvent('boost', self._ownership, self, self.value)
         else:
-            return f'{self._ownership} consumed {self.name}\n{self.potion_type.capitalize()} potion has been consumed'
+            return ItemEvent('consume', self._ownership, self, self.value)
 
     def to_json(self):
         """Convert Potion instance to JSON-encodable dictionary."""
         return {
             'class': self.__class__.__name__,
             'name': self.name,
+            'description': self.description,
             'potion_type': self.potion_type,
             'value': self.value,
             'effective_time': self.effective_time,
             'rarity': self.rarity,
-            'empty': self.empty
+            'empty': self.empty,
+            'ownership': self._ownership
         }
 
     @classmethod
@@ -233,52 +359,155 @@ class Potion(Item):
             effective_time=data['effective_time'],
             rarity=data['rarity']
         )
+        potion.description = data.get('description', '')
         potion.empty = data.get('empty', False)
+        potion._ownership = data.get('ownership')
         return potion
 
 class Inventory:
     def __init__(self, owner=None):
-        """Initialize the inventory with an owner and an empty item list."""
-        self.items = []
+        """
+        Initialize the inventory with an owner and no items.
+
+        Items are kept in a dict keyed by id(item), in the order they were added,
+        with secondary indexes by class and by rarity, so adding, removing and
+        membership tests are O(1) and filtered views only touch matching items.
+        The class and rarity each item was indexed under are recorded, so that
+        removing it still works after its rarity was changed.
+        """
+        self._items = {}
+        self._order = {}
+        self._by_class = {}
+        self._by_rarity = {}
+        self._index_keys = {}
+        self._unsorted = set()
+        self._next_order = 0
         self.owner = owner
+        self._snapshots = {}
+        self._next_snapshot = 0
+        self._dirty = None
+        self._removed = []
+
+    @property
+    def items(self):
+        """
+        The items in the order they were added, as a tuple.
+
+        This used to be a plain list attribute. It is now read-only: add and
+        remove items with add_item and remove_item.
+        """
+        return tuple(self._items.values())
 
     def add_item(self, item):
         """Add an item to the inventory and assign ownership."""
         item._ownership = self.owner
-        self.items.append(item)
+        item.changed()
+        self._insert(item)
+
+    def _insert(self, item):
+        """Index item without touching its ownership, for items restored from a save."""
+        key = id(item)
+        if key in self._items:
+            return
+        if self._dirty is not None:
+            item._tracker = self._dirty
+            self._dirty.add(item)
+        self._items[key] = item
+        self._order[key] = self._next_order
+        self._next_order += 1
+        self._index(key, item)
+
+    def _index(self, key, item):
+        self._index_keys[key] = type(item), item.rarity
+        self._by_class.setdefault(type(item), {})[key] = item
+        self._by_rarity.setdefault(item.rarity, {})[key] = item
+
+    def _unindex(self, key):
+        for index, value in zip((self._by_class, self._by_rarity), self._index_keys.pop(key)):
+            self._leave(index, value, key)
+
+    def _leave(self, index, value, key):
+        bucket = index[value]
+        del bucket[key]
+        if not bucket:
+            del index[value]
+            self._unsorted.discard((id(index), value))
+
+    def _join(self, index, value, key, item):
+        """Append item to index[value], noting the bucket as out of order if an older item lands last."""
+        bucket = index.setdefault(value, {})
+        if bucket and self._order[next(reversed(bucket))] > self._order[key]:
+            self._unsorted.add((id(index), value))
+        bucket[key] = item
+
+    def _bucket(self, index, value):
+        """index[value] in the order items were added, re-sorted first if touch left it out of order."""
+        bucket = index.get(value, {})
+        if (id(index), value) in self._unsorted:
+            order = self._order
+            bucket = index[value] = dict(sorted(bucket.items(), key=lambda entry: order[entry[0]]))
+            self._unsorted.discard((id(index), value))
+        return bucket
+
+    def _discard(self, item):
+        key = id(item)
+        if key not in self._items:
+            return False
+        del self._items[key]
+        if self._dirty is not None:
+            self._removed.append(self._order[key])
+            self._dirty.discard(item)
+            item._tracker = None
+        self._unindex(key)
+        del self._order[key]
+        item._ownership = None
+        return True
 
     def remove_item(self, item):
         """Remove an item from the inventory."""
-        if item in self.items:
-            item._ownership = None
-            self.items.remove(item)
+        self._discard(item)
 
     def drop_item(self, item):
         """Drop an item from the inventory."""
-        if item in self.items:
-            item._ownership = None  # Reset ownership
-            self.items.remove(item)
-            print(f'{item.name} has been dropped by {self.owner}.')
+        if self._discard(item):
+            emit(ItemEvent('drop', self.owner, item))
         else:
-            print(f'{item.name} is not in the inventory.')
+            emit(ItemEvent('not_in_inventory', self.owner, item))
+
+    def filter(self, item_type=None, rarity=None):
+        """Return the items of item_type (subclasses included) and/or rarity, in the order they were added."""
+        if item_type is None and rarity is None:
+            return list(self._items.values())
+        if item_type is None:
+            return list(self._bucket(self._by_rarity, rarity).values())
+        buckets = [self._bucket(self._by_class, cls) for cls in list(self._by_class) if issubclass(cls, item_type)]
+        if len(buckets) == 1:
+            matches = buckets[0].values()
+        else:
+            matches = heapq.merge(*(bucket.values() for bucket in buckets), key=lambda item: self._order[id(item)])
+        if rarity is not None:
+            return [item for item in matches if item.rarity == rarity]
+        return list(matches)
 
-    def view(self, item_type=None):
+    def view(self, item_type=None, rarity=None):
         if item_type:
-            filtered_items = [item for item in self.items if isinstance(item, item_type)]
-            for item in filtered_items:
+            for item in self.filter(item_type, rarity):
                 print(item.description)
         else:
-            for item in self.items:
+            for item in self.filter(rarity=rarity):
                 print(item)
 
 
     def __iter__(self):
-        """Allow iteration over the inventory's items."""
-        return iter(self.items)
+        """Iterate over the items without copying them; iterate over inventory.items to remove items meanwhile."""
+        return iter(self._items.values())
+
+    def __len__(self):
+        return len(self._items)
 
     def __contains__(self, item):
         """Check if an item is in the inventory."""
-        return item in self.items
+        return id(item) in self._items
 
     def to_json(self):
         """
@@ -286,7 +515,7 @@ class Inventory:
         """
         return {
             'owner': self.owner,
-            'items': [item.to_json() for item in self.items]
+            'items': [item.to_json() for item in self._items.values()]
         }
 
     @classmethod
@@ -302,23 +531,271 @@ class Inventory:
         """
         inventory = cls(data['owner'])
         for item_data in data['items']:
-            item_class = globals()[item_data['class']]
-            item = item_class.from_json(item_data)
-            inventory.add_item(item)
+            inventory._insert(restore_item(item_data, inventory.owner))
         return inventory
 
     def save_to_file(self, filename):
-        """Save the inventory to a file in JSON format."""
+        """Save the inventory to a file in JSON format, or as JSON Lines if filename ends with .jsonl."""
+        if filename.endswith('.jsonl'):
+            self.save_to_jsonl(filename)
+            return
         with open(filename, 'w') as f:
             json.dump(self.to_json(), f, cls=CustomEncoder)
 
     @classmethod
     def load_from_file(cls, filename):
-        """Load the inventory from a JSON file."""
+        """Load the inventory from a JSON file, or from JSON Lines if filename ends with .jsonl."""
+        if filename.endswith('.jsonl'):
+            return cls.load_from_jsonl(filename)
         with open(filename, 'r') as f:
             data = json.load(f)
             return cls.from_json(data)
 
+    def save_to_jsonl(self, filename):
+        """
+        Save the inventory as JSON Lines: a header record with the owner, then one item per line.
+
+        Items are encoded and written one at a time, so memory use does not grow with the inventory.
+        """
+        encoder = CustomEncoder()
+        with open(filename, 'w') as f:
+            f.write(encoder.encode({'owner': self.owner, 'version': JSONL_VERSION}) + '\n')
+            for item in self._items.values():
+                f.write(encoder.encode(item.to_json()) + '\n')
+
+    @staticmethod
+    def read_jsonl_owner(filename):
+        """Return the owner stored in the header of a JSON Lines save."""
+        with open(filename, 'r') as f:
+            return read_jsonl_header(f)['owner']
+
+    @staticmethod
+    def iter_jsonl(filename, item_type=None, limit=None):
+        """
+        Lazily yield the items of a JSON Lines save with the state they were saved in.
+
+        Args:
+            filename (str): file written by save_to_jsonl.
+            item_type (type): only build items of this class or its subclasses.
+            limit (int): stop after this many items.
+        """
+        if limit is not None and limit <= 0:
+            return
+        count = 0
+        with open(filename, 'r') as f:
+            owner = read_jsonl_header(f)['owner']
+            for line in f:
+                if not line.strip():
+                    continue
+                item_data = json.loads(line)
+                if item_type is not None and not issubclass(item_class_for(item_data['class']), item_type):
+                    continue
+                yield restore_item(item_data, owner)
+                count += 1
+                if count == limit:
+                    return
+
+    @classmethod
+    def load_from_jsonl(cls, filename, item_type=None, limit=None):
+        """Load an inventory from a JSON Lines save, optionally only the first limit items of item_type."""
+        inventory = cls(cls.read_jsonl_owner(filename))
+        for item in cls.iter_jsonl(filename, item_type, limit):
+            inventory._insert(item)
+        return inventory
+
+    def touch(self, item):
+        """
+        Record a change made by assigning to an item's attributes directly.
+
+        The next snapshot saves the item, and if its rarity was changed it moves
+        to the matching rarity index, so filter(rarity=...) finds it there.
+        """
+        key = id(item)
+        if key not in self._items:
+            return
+        indexed = self._index_keys[key]
+        current = self._index_keys[key] = type(item), item.rarity
+        # Buckets an older item joins are only re-sorted when filter next reads them, keeping touch O(1).
+        for index, old, new in zip((self._by_class, self._by_rarity), indexed, current):
+            if old != new:
+                self._leave(index, old, key)
+                self._join(index, new, key, item)
+        if self._dirty is not None:
+            self._dirty.add(item)
+
+    def snapshot(self, filename=None):
+        """
+        Capture the inventory as a save point and return its number.
+
+        A snapshot holds only the states of the items added or changed since the
+        previous one and the order numbers of the items removed since then, so
+        it costs time and memory in proportion to the changes. Changes made
+        through item methods are tracked automatically; direct attribute
+        assignments need touch(item). The first snapshot, and the first after a
+        restore, records every item. With filename, the same delta is written as
+        JSON Lines, and load_snapshot can rebuild the inventory from the files.
+        """
+        full = self._dirty is None
+        if full:
+            self._dirty = set()
+            for item in self._items.values():
+                item._tracker = self._dirty
+            changed_items = self._items.values()
+            self._removed = []
+        else:
+            changed_items = self._dirty
+        order = self._order
+        changed = sorted((order[id(item)], item) for item in changed_items)
+        snapshot = Snapshot(self._next_snapshot, {key: item.to_json() for key, item in changed}, self._removed, full)
+        self._snapshots[snapshot.number] = snapshot
+        self._next_snapshot += 1
+        self._dirty.clear()
+        self._removed = []
+        if filename is not None:
+            snapshot.write(filename, self.owner)
+        return snapshot.number
+
+    def _states_at(self, number):
+        """Item states by order number at snapshot number, replayed from the latest full snapshot before it."""
+        if number not in self._snapshots:
+            raise ValueError(f'No snapshot {number}')
+        chain = []
+        for earlier in range(number, -1, -1):
+            snapshot = self._snapshots[earlier]
+            chain.append(snapshot)
+            if snapshot.full:
+                break
+        states = {}
+        for snapshot in reversed(chain):
+            snapshot.apply(states)
+        return states
+
+    def restore(self, number):
+        """Replace the items with copies of them as they were at snapshot number."""
+        items = [restore_item(item_data, self.owner) for item_data in self._states_at(number).values()]
+        for item in self._items.values():
+            item._tracker = None
+        self._items = {}
+        self._order = {}
+        self._by_class = {}
+        self._by_rarity = {}
+        self._index_keys = {}
+        self._unsorted = set()
+        self._dirty = None
+        self._removed = []
+        for item in items:
+            self._insert(item)
+
+    def drop_snapshots(self, before, filename=None):
+        """
+        Forget every snapshot older than before, which becomes a full snapshot.
+
+        The deltas up to before are merged into it, so restoring before and later
+        snapshots still works. With filename, the merged snapshot is written there
+        and the delta files of the dropped snapshots are no longer needed.
+        """
+        merged = Snapshot(before, self._states_at(before), [], True)
+        for number in list(self._snapshots):
+            if number >= before:
+                break
+            del self._snapshots[number]
+        self._snapshots[before] = merged
+        if filename is not None:
+            merged.write(filename, self.owner)
+
+    @classmethod
+    def load_snapshot(cls, filenames):
+        """Rebuild an inventory by replaying snapshot delta files, oldest first, up to the last one given."""
+        owner = None
+        states = {}
+        for filename in filenames:
+            owner, snapshot = Snapshot.read(filename)
+            snapshot.apply(states)
+        inventory = cls(owner)
+        for item_data in states.values():
+            inventory._insert(restore_item(item_data, owner))
+        return inventory
+
+JSONL_VERSION = 1
+SNAPSHOT_VERSION = 1
+
+class Snapshot:
+    """
+    One save point of an Inventory: the states of the items added or changed since
+    the previous snapshot keyed by their order number, in order, and the order
+    numbers removed since then. A full snapshot holds every item.
+    """
+    __slots__ = ('number', 'changed', 'removed', 'full')
+
+    def __init__(self, number, changed, removed, full):
+        self.number = number
+        self.changed = changed
+        self.removed = removed
+        self.full = full
+
+    def apply(self, states):
+        """Bring states, item states by order number, from the previous snapshot to this one."""
+        if self.full:
+            states.clear()
+        for key in self.removed:
+            states.pop(key, None)
+        # Order numbers only grow, so new items are appended after the existing ones.
+        states.update(self.changed)
+
+    def write(self, filename, owner):
+        encoder = CustomEncoder()
+        with open(filename, 'w') as f:
+            f.write(encoder.encode({'owner': owner, 'snapshot': self.number, 'full': self.full,
+                                    'removed': self.removed, 'version': SNAPSHOT_VERSION}) + '\n')
+            for key, item_data in self.changed.items():
+                f.write(encoder.encode({'key': key, 'item': item_data}) + '\n')
+
+    @classmethod
+    def read(cls, filename):
+        """Return the owner and the Snapshot stored in filename."""
+        with open(filename, 'r') as f:
+            header = json.loads(f.readline() or 'null')
+            if not isinstance(header, dict) or 'snapshot' not in header:
+                raise ValueError(f'{filename} is not an inventory snapshot')
+            if header.get('version', SNAPSHOT_VERSION) > SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported inventory snapshot version {header['version']}")
+            changed = {}
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    changed[record['key']] = record['item']
+        return header['owner'], cls(header['snapshot'], changed, header['removed'], header['full'])
+
+def read_jsonl_header(f):
+    header = json.loads(f.readline() or 'null')
+    if not isinstance(header, dict) or 'owner' not in header:
+        raise ValueError('Not an inventory JSON Lines file: missing owner header')
+    if header.get('version', JSONL_VERSION) > JSONL_VERSION:
+        raise ValueError(f"Unsupported inventory JSON Lines version {header['version']}")
+    return header
+
+def item_class_for(name):
+    """Return the registered item class called name."""
+    try:
+        return ITEM_CLASSES[name]
+    except KeyError:
+        raise ValueError(f'Unknown item class {name!r}') from None
+
+def item_from_json(item_data):
+    """Build an item from its to_json() data with the from_json of the class it names."""
+    try:
+        decode = ITEM_DECODERS[item_data['class']]
+    except KeyError:
+        raise ValueError(f"Unknown item class {item_data.get('class')!r}") from None
+    return decode(item_data)
+
+def restore_item(item_data, owner):
+    """Build a saved item with its saved ownership; saves from before ownership was stored fall back to owner."""
+    item = item_from_json(item_data)
+    if 'ownership' not in item_data:
+        item._ownership = owner
+    return item
+
 
 class CustomEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -328,54 +805,55 @@ class CustomEncoder(json.JSONEncoder):
 
 import json
 
-# Example of creating various items
-master_sword = SingleHandedWeapon(name='Master Sword', rarity='legendary', damage=300, type='sword')
-muramasa = DoubleHandedWeapon(name='Muramasa', rarity='legendary', damage=580, type='katana')
-gungnir = Pike(name='Gungnir', rarity='legendary', damage=290, type='spear')
-belthronding = RangedWeapon(name='Belthronding', rarity='legendary', damage=500, type='bow')
+if __name__ == "__main__":
+    # Example of creating various items
+    master_sword = SingleHandedWeapon(name='Master Sword', rarity='legendary', damage=300, type='sword')
+    muramasa = DoubleHandedWeapon(name='Muramasa', rarity='legendary', damage=580, type='katana')
+    gungnir = Pike(name='Gungnir', rarity='legendary', damage=290, type='spear')
+    belthronding = RangedWeapon(name='Belthronding', rarity='legendary', damage=500, type='bow')
 
-round_shield = Shield(name='Round Shield', description='A sturdy wooden shield', defense=10, rarity='common')
-broken_pot_lid = Shield(name='Broken Pot Lid', defense=1, broken=True, rarity='common')
+    round_shield = Shield(name='Round Shield', description='A sturdy wooden shield', defense=10, rarity='common')
+    broken_pot_lid = Shield(name='Broken Pot Lid', defense=1, broken=True, rarity='common')
 
-attack_potion = Potion.from_ability(name='Atk Potion Temp', owner='Beleg', potion_type='attack')
-healing_potion = Potion(name='Healing Potion', potion_type='healing', value=50, effective_time=0, rarity='uncommon')
+    attack_potion = Potion.from_ability(name='Atk Potion Temp', owner='Beleg', potion_type='attack')
+    healing_potion = Potion(name='Healing Potion', potion_type='healing', value=50, effective_time=0, rarity='uncommon')
 
-# Create and populate an inventory
-beleg_backpack = Inventory(owner='Beleg')
-beleg_backpack.add_item(master_sword)
-beleg_backpack.add_item(muramasa)
-beleg_backpack.add_item(gungnir)
-beleg_backpack.add_item(belthronding)
-beleg_backpack.add_item(round_shield)
-beleg_backpack.add_item(broken_pot_lid)
-beleg_backpack.add_item(attack_potion)
-beleg_backpack.add_item(healing_potion)
+    # Create and populate an inventory
+    beleg_backpack = Inventory(owner='Beleg')
+    beleg_backpack.add_item(master_sword)
+    beleg_backpack.add_item(muramasa)
+    beleg_backpack.add_item(gungnir)
+    beleg_backpack.add_item(belthronding)
+    beleg_backpack.add_item(round_shield)
+    beleg_backpack.add_item(broken_pot_lid)
+    beleg_backpack.add_item(attack_potion)
+    beleg_backpack.add_item(healing_potion)
 
-print("Initial Inventory:")
-beleg_backpack.view()
+    print("Initial Inventory:")
+    beleg_backpack.view()
 
-if master_sword in beleg_backpack:
-    master_sword.equip()
-    print(master_sword.use())
+    if master_sword in beleg_backpack:
+        master_sword.equip()
+        print(master_sword.use())
 
-if round_shield in beleg_backpack:
-    round_shield.equip()
-    print(round_shield.use())
+    if round_shield in beleg_backpack:
+        round_shield.equip()
+        print(round_shield.use())
 
 
-print(attack_potion.use())
-print(attack_potion.use())
+    print(attack_potion.use())
+    print(attack_potion.use())
 
-beleg_backpack.save_to_file('full_inventory.json')
-print("Inventory saved to 'full_inventory.json'")
+    beleg_backpack.save_to_file('full_inventory.json')
+    print("Inventory saved to 'full_inventory.json'")
 
 
-loaded_inventory = Inventory.load_from_file('full_inventory.json')
-print("Loaded Inventory:")
+    loaded_inventory = Inventory.load_from_file('full_inventory.json')
+    print("Loaded Inventory:")
 
-loaded_inventory.view()
+    loaded_inventory.view()
 
-loaded_inventory.drop_item(broken_pot_lid)
+    loaded_inventory.drop_item(broken_pot_lid)
 
-loaded_inventory.save_to_file('modified_inventory.json')
-print("Modified inventory saved to 'modified_inventory.json'")
+    loaded_inventory.save_to_file('modified_inventory.json')
+    print("Modified inventory saved to 'modified_inventory.json'")